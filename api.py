@@ -0,0 +1,363 @@
+"""API HTTP/JSON local con los agregados de las secciones 1 a 5, sin Streamlit.
+
+Expone las mismas funciones de `secciones` que usa el panel, con los
+parametros de la barra lateral como argumentos de la consulta:
+
+    python api.py [--puerto 8765]
+    curl "localhost:8765/generos_por_pais?tipos=Movie&año_min=2010&paises=India,Japan"
+
+Rutas: /metricas, /generos_por_pais, /generos_por_rating, /directores,
+/duracion_por_pais y /tiempo_incorporacion. Parametros (todos opcionales):
+tipos, año_min, año_max, paises y ratings (separados por coma, en cualquier
+orden; `paises=` es ninguno), top_generos y top_autores. Cualquier otro
+parametro responde 400.
+
+Un solo catalogo en memoria (con sus indices y su cubo) atiende a todos los
+hilos del servidor; si el CSV cambia se recarga en la siguiente consulta.
+Las respuestas se guardan ya serializadas en una cache LRU y llevan un ETag:
+repetir una consulta no recalcula nada y con `If-None-Match` responde 304
+sin cuerpo. Con `--prueba` mide consultas por segundo contra un servidor
+local:
+
+    python api.py --prueba 2000 --clientes 8
+"""
+import argparse
+import hashlib
+import http.client
+import json
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+import datos
+import secciones
+from indices import construir_indices
+from memo import CacheLRU
+
+PUERTO = 8765
+
+# Respuestas serializadas que se conservan (sin vencimiento: el ETag cambia
+# con la version del CSV y la cache se vacia al recargar)
+MAX_RESPUESTAS = 1024
+
+# Parametros admitidos: cualquier otro (un filtro mal escrito) responde 400
+PARAMETROS = (
+    "tipos", "año_min", "año_max", "paises", "ratings", "top_generos", "top_autores"
+)
+
+
+class ErrorConsulta(ValueError):
+    """Parametros invalidos: se responde 400."""
+
+
+# ── Catalogo compartido ───────────────────────────────────────────────────────
+# Una version cargada del CSV: se reemplaza entera, nunca campo por campo
+Estado = namedtuple(
+    "Estado", ["version", "df", "puente_pais", "indices", "cubo", "año_max"]
+)
+
+
+class Catalogo:
+    """Catalogo, indices y cubo del CSV, compartidos por todos los hilos."""
+
+    def __init__(self, ruta=datos.RUTA_CATALOGO):
+        self.ruta = ruta
+        self.estado = None
+        self.respuestas = CacheLRU(MAX_RESPUESTAS)
+        self._candado = threading.Lock()
+
+    def actual(self):
+        """El `Estado` de la version vigente del CSV, recargado si cambio."""
+        version = datos.version_archivo(self.ruta)
+        estado = self.estado
+        if estado is not None and estado.version == version:
+            return estado
+        with self._candado:
+            if self.estado is None or self.estado.version != version:
+                df, puente_pais, puente_genero = datos.cargar_catalogo(self.ruta)
+                self.estado = Estado(
+                    version,
+                    df,
+                    puente_pais,
+                    construir_indices(df, puente_pais, puente_genero),
+                    datos.cargar_cubo(self.ruta),
+                    int(df["release_year"].max()),
+                )
+                self.respuestas.limpiar()
+            return self.estado
+
+
+# ── Parametros ────────────────────────────────────────────────────────────────
+def _lista(parametros, nombre, defecto=()):
+    # Un conjunto: sin repetidos y ordenado. Vacio (`paises=`) es un conjunto
+    # vacio; ausente, el valor por defecto
+    valor = parametros.get(nombre)
+    if valor is None:
+        return tuple(sorted(set(defecto)))
+    return tuple(sorted({v.strip() for v in valor.split(",") if v.strip()}))
+
+
+def _entero(parametros, nombre, defecto, rango=None):
+    try:
+        valor = int(parametros.get(nombre) or defecto)
+    except ValueError:
+        raise ErrorConsulta(f"{nombre} debe ser un entero") from None
+    if rango is not None and not rango[0] <= valor <= rango[1]:
+        raise ErrorConsulta(f"{nombre} debe estar entre {rango[0]} y {rango[1]}")
+    return valor
+
+
+def normalizar(estado, parametros):
+    """Parametros con los valores por defecto del panel, en forma canonica.
+
+    Dos consultas equivalentes (orden distinto, valores por defecto
+    explicitos) dan los mismos parametros y comparten la entrada de cache.
+    """
+    desconocidos = sorted(set(parametros) - set(PARAMETROS))
+    if desconocidos:
+        raise ErrorConsulta(
+            f"parametros desconocidos: {', '.join(desconocidos)}; "
+            f"se admiten {', '.join(PARAMETROS)}"
+        )
+    año_min = _entero(parametros, "año_min", 2000)
+    año_max = _entero(parametros, "año_max", estado.año_max)
+    paises_top = secciones.paises_principales(estado.puente_pais, 30)
+    return {
+        "tipos": _lista(parametros, "tipos", ("Movie", "TV Show")),
+        "año_min": min(año_min, año_max),
+        "año_max": max(año_min, año_max),
+        "paises": _lista(parametros, "paises", paises_top[:10]),
+        "ratings": _lista(parametros, "ratings"),
+        "top_generos": _entero(parametros, "top_generos", 10, (1, 50)),
+        "top_autores": _entero(parametros, "top_autores", 10, (1, 50)),
+    }
+
+
+# ── Rutas ─────────────────────────────────────────────────────────────────────
+def _registros(df):
+    return json.loads(df.to_json(orient="records", force_ascii=False))
+
+
+def metricas(e, p, filtro):
+    return secciones.metricas(e.indices, e.puente_pais, *filtro)
+
+
+def generos_por_pais(e, p, filtro):
+    if not p["paises"]:
+        return []
+    pivot = secciones.generos_por_pais(
+        e.cubo, *filtro, p["paises"], p["top_generos"]
+    )
+    return _registros(
+        pivot.rename_axis(index="pais", columns="genero")
+        .stack()
+        .rename("cantidad")
+        .reset_index()
+        .astype({"pais": str, "genero": str, "cantidad": int})
+    )
+
+
+def generos_por_rating(e, p, filtro):
+    generos, ratings = secciones.opciones_rating(e.cubo, *filtro, p["top_generos"])
+    tabla = secciones.generos_por_rating(
+        e.cubo, *filtro, tuple(generos), p["ratings"] or tuple(ratings[:8])
+    )
+    return {"ratings": ratings, "conteos": _registros(tabla.astype({"rating": str}))}
+
+
+def directores(e, p, filtro):
+    resultado = secciones.directores(e.cubo, *filtro, p["top_autores"])
+    return {
+        "tabla": _registros(resultado["tabla"]),
+        "por_año": _registros(resultado["por_año"].astype({"director": str})),
+        "por_rating": _registros(
+            resultado["por_rating"].astype({"director": str, "rating": str})
+        ),
+    }
+
+
+def duracion_por_pais(e, p, filtro):
+    return _registros(secciones.duracion_por_pais(e.cubo, *filtro, p["paises"]))
+
+
+def tiempo_incorporacion(e, p, filtro):
+    resultado = secciones.tiempo_incorporacion(e.cubo, *filtro)
+    return {
+        "resumen": _registros(resultado["resumen"]),
+        "histograma": _registros(resultado["histograma"]),
+        "evolucion": _registros(resultado["evolucion"]),
+    }
+
+
+RUTAS = {
+    "/metricas": metricas,
+    "/generos_por_pais": generos_por_pais,
+    "/generos_por_rating": generos_por_rating,
+    "/directores": directores,
+    "/duracion_por_pais": duracion_por_pais,
+    "/tiempo_incorporacion": tiempo_incorporacion,
+}
+
+
+def responder(catalogo, ruta, parametros):
+    """(ETag, cuerpo JSON) de una consulta, desde la cache si ya se calculo."""
+    estado = catalogo.actual()
+    p = normalizar(estado, parametros)
+    clave = (ruta, estado.version, tuple(p.items()))
+
+    def calcular():
+        filtro = (p["tipos"], p["año_min"], p["año_max"])
+        datos_ruta = RUTAS[ruta](estado, p, filtro)
+        cuerpo = json.dumps(
+            {"parametros": p, "datos": datos_ruta}, ensure_ascii=False, default=str
+        ).encode("utf-8")
+        return f'"{hashlib.blake2b(cuerpo, digest_size=16).hexdigest()}"', cuerpo
+
+    return catalogo.respuestas.obtener(clave, calcular)
+
+
+# ── Servidor ──────────────────────────────────────────────────────────────────
+class Manejador(BaseHTTPRequestHandler):
+    # HTTP/1.1: los clientes reutilizan la conexion entre consultas. Sin
+    # Nagle, el cuerpo no espera el ACK retrasado de los encabezados
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    catalogo = None
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path not in RUTAS:
+            return self._enviar(404, _error(f"ruta desconocida: {url.path}"))
+        # `http.server` decodifica la linea de pedido como latin-1: un `año_min`
+        # enviado sin codificar llega como bytes UTF-8 mal leidos
+        consulta = url.query.encode("latin-1").decode("utf-8", "replace")
+        consulta = parse_qs(consulta, keep_blank_values=True)
+        parametros = {k: v[-1] for k, v in consulta.items()}
+        try:
+            etag, cuerpo = responder(self.catalogo, url.path, parametros)
+        except ErrorConsulta as error:
+            return self._enviar(400, _error(str(error)))
+        if self.headers.get("If-None-Match") == etag:
+            return self._enviar(304, b"", etag)
+        self._enviar(200, cuerpo, etag)
+
+    def _enviar(self, estado, cuerpo, etag=None):
+        self.send_response(estado)
+        if estado != 304:
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        if etag is not None:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def _error(mensaje):
+    return json.dumps({"error": mensaje}, ensure_ascii=False).encode("utf-8")
+
+
+def crear_servidor(puerto=PUERTO, ruta=datos.RUTA_CATALOGO, host="127.0.0.1"):
+    """Servidor con un hilo por conexion y el catalogo ya cargado."""
+    manejador = type("Manejador", (Manejador,), {"catalogo": Catalogo(ruta)})
+    manejador.catalogo.actual()
+    return ThreadingHTTPServer((host, puerto), manejador)
+
+
+# ── Prueba de carga ───────────────────────────────────────────────────────────
+def _consultas(n):
+    """`n` consultas variadas: rutas × tipos × rangos de años."""
+    tipos = ["Movie", "TV Show", "Movie,TV Show"]
+    rangos = [(a, 2021) for a in range(1980, 2021)]
+    consultas = []
+    for i in range(n):
+        año_min, año_max = rangos[(i // len(RUTAS)) % len(rangos)]
+        parametros = {
+            "tipos": tipos[(i // (len(RUTAS) * len(rangos))) % len(tipos)],
+            "año_min": año_min,
+            "año_max": año_max,
+        }
+        consultas.append(f"{list(RUTAS)[i % len(RUTAS)]}?{urlencode(parametros)}")
+    return consultas
+
+
+def _ronda(puerto, consultas, clientes, etags=None):
+    """Consultas por segundo y estados HTTP con `clientes` conexiones."""
+
+    def cliente(parte):
+        conexion = http.client.HTTPConnection("127.0.0.1", puerto)
+        estados, vistos = [], {}
+        for consulta in parte:
+            encabezados = {}
+            if etags is not None and consulta in etags:
+                encabezados["If-None-Match"] = etags[consulta]
+            conexion.request("GET", consulta, headers=encabezados)
+            respuesta = conexion.getresponse()
+            respuesta.read()
+            estados.append(respuesta.status)
+            vistos[consulta] = respuesta.getheader("ETag")
+        conexion.close()
+        return estados, vistos
+
+    partes = [consultas[i::clientes] for i in range(clientes)]
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(clientes) as ejecutor:
+        resultados = list(ejecutor.map(cliente, partes))
+    segundos = time.perf_counter() - inicio
+    estados = [e for r in resultados for e in r[0]]
+    vistos = {k: v for r in resultados for k, v in r[1].items()}
+    conteo = {e: estados.count(e) for e in set(estados)}
+    return len(consultas) / segundos, conteo, vistos
+
+
+def prueba_carga(n=2000, clientes=8, ruta=datos.RUTA_CATALOGO):
+    """Consultas/s sin cache, con la cache llena y con ETag (304)."""
+    servidor = crear_servidor(0, ruta)
+    puerto = servidor.server_address[1]
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    try:
+        consultas = _consultas(n)
+        distintas = len(set(consultas))
+        fria, estados_fria, etags = _ronda(puerto, consultas, clientes)
+        caliente, estados_caliente, _ = _ronda(puerto, consultas, clientes)
+        condicional, estados_cond, _ = _ronda(puerto, consultas, clientes, etags)
+    finally:
+        servidor.shutdown()
+        servidor.server_close()
+    print(f"{n} consultas ({distintas} distintas), {clientes} clientes")
+    print(f"  primera pasada   {fria:8.0f} consultas/s  {estados_fria}")
+    print(f"  cache llena      {caliente:8.0f} consultas/s  {estados_caliente}")
+    print(f"  If-None-Match    {condicional:8.0f} consultas/s  {estados_cond}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalogo", default=datos.RUTA_CATALOGO)
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--prueba", type=int, metavar="N", help="prueba de carga")
+    parser.add_argument("--clientes", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    if args.prueba:
+        prueba_carga(args.prueba, args.clientes, args.catalogo)
+        return 0
+    servidor = crear_servidor(args.puerto, args.catalogo)
+    print(f"Sirviendo en http://127.0.0.1:{args.puerto}", file=sys.stderr)
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
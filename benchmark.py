@@ -0,0 +1,277 @@
+"""Benchmark del pipeline de datos del panel, sin Streamlit.
+
+Mide tiempo y memoria pico de cada etapa (carga, indices, cubo y la
+preparacion de cada seccion) sobre el catalogo real y sobre catalogos
+sinteticos escalados, y compara contra una linea base guardada:
+
+    python benchmark.py                      # escalas 1 y 10
+    python benchmark.py --escalas 1 100      # incluye el catalogo ×100
+    python benchmark.py --guardar            # actualiza la linea base
+
+Sale con codigo 1 si alguna etapa empeora mas que la tolerancia.
+"""
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import datos
+import secciones
+from busqueda import construir_busqueda
+from cubo import construir_cubo
+from grafo import construir_grafo
+from indices import construir_indices
+from similares import construir_similares
+from tendencias import construir_tendencias
+
+RUTA_BASE = Path("benchmark_base.json")
+
+# Columnas con varios valores separados por coma
+COLUMNAS_MULTIPLES = ["country", "listed_in", "cast"]
+
+# Filtros con los valores por defecto del panel
+TIPOS = ("Movie", "TV Show")
+AÑOS = (2000, 2021)
+TOP_N_GENEROS = 10
+TOP_N_AUTORES = 10
+FECHAS = ("2008-01-01", "2021-12-31")
+
+# Ejecuciones cronometradas de cada etapa: se guarda la mas rapida
+REPETICIONES = 3
+
+# Por debajo de estos valores las diferencias son ruido de medicion
+MINIMO = {"segundos": 0.05, "pico_mb": 1.0}
+
+
+# ── Catalogos sinteticos ──────────────────────────────────────────────────────
+def _listas_sinteticas(columna, filas, rng):
+    """Listas nuevas con el largo de `filas` y valores tomados con la
+    frecuencia de cada valor en el catalogo original."""
+    partes = columna.str.split(", ")
+    frecuencias = partes.explode().value_counts(normalize=True)
+    largos = partes.iloc[filas].str.len().fillna(0).to_numpy(dtype=np.int64)
+    valores = rng.choice(
+        frecuencias.index.to_numpy(), size=largos.sum(), p=frecuencias.to_numpy()
+    )
+    listas = np.split(valores, np.cumsum(largos)[:-1])
+    resultado = [", ".join(dict.fromkeys(lista)) for lista in listas]
+    return pd.Series(resultado, dtype="str").where(largos > 0)
+
+
+def escribir_sintetico(ruta, factor, base=datos.RUTA_CATALOGO, semilla=0):
+    """CSV con `factor` veces las filas de `base`, escrito por bloques.
+
+    Cada bloque remuestrea filas reales y rearma paises, generos y reparto
+    con las frecuencias originales, de modo que las combinaciones (y por lo
+    tanto las celdas del cubo y las tablas puente) crecen con la escala.
+    """
+    original = pd.read_csv(base, dtype=datos.TIPOS_CSV)
+    rng = np.random.default_rng(semilla)
+    for bloque in range(factor):
+        filas = rng.integers(0, len(original), size=len(original))
+        copia = original.iloc[filas].reset_index(drop=True)
+        copia["show_id"] = [f"s{bloque}_{i}" for i in range(len(copia))]
+        for columna in COLUMNAS_MULTIPLES:
+            copia[columna] = _listas_sinteticas(original[columna], filas, rng)
+        copia.to_csv(ruta, mode="a" if bloque else "w", header=not bloque, index=False)
+    return ruta
+
+
+# ── Etapas ────────────────────────────────────────────────────────────────────
+def _medir(nombre, funcion, resultados):
+    """Tiempo de `funcion` (el menor de `REPETICIONES`) y su pico de memoria.
+
+    El rastreo de `tracemalloc` encarece cada asignacion, asi que el tiempo
+    se toma sin el y el pico en una pasada aparte. El pico cuenta las
+    asignaciones de Python y numpy; los buffers de Arrow (columnas de texto)
+    no pasan por `tracemalloc` y quedan fuera.
+    """
+    segundos = float("inf")
+    for _ in range(REPETICIONES):
+        inicio = time.perf_counter()
+        valor = funcion()
+        segundos = min(segundos, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    funcion()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    resultados[nombre] = {"segundos": segundos, "pico_mb": pico / 2**20}
+    return valor
+
+
+def medir_pipeline(ruta):
+    """Tiempo y memoria pico de cada etapa sobre el CSV `ruta`.
+
+    Las funciones de seccion se llaman sin su cache (`__wrapped__`) para
+    medir el calculo y no el acierto.
+    """
+    r = {}
+    crudo = pd.read_csv(ruta, dtype=datos.TIPOS_CSV)
+    _medir("validacion", lambda: datos.validar(crudo), r)
+    del crudo
+    df, puente_pais, puente_genero = _medir(
+        "carga", lambda: datos.cargar_catalogo(ruta, directorio_cache=None), r
+    )
+    indices = _medir(
+        "indices", lambda: construir_indices(df, puente_pais, puente_genero), r
+    )
+    cubo = _medir(
+        "cubo", lambda: construir_cubo(df, puente_pais, puente_genero), r
+    )
+
+    filtro = (TIPOS, *AÑOS)
+    paises = tuple(secciones.paises_principales.__wrapped__(puente_pais, 30)[:10])
+    _medir("filtro_base", lambda: secciones.filtro_base.__wrapped__(indices, *filtro), r)
+    _medir(
+        "seccion_1",
+        lambda: secciones.generos_por_pais.__wrapped__(
+            cubo, *filtro, paises, TOP_N_GENEROS
+        ),
+        r,
+    )
+
+    def seccion_2():
+        generos, ratings = secciones.opciones_rating.__wrapped__(
+            cubo, *filtro, TOP_N_GENEROS
+        )
+        return secciones.generos_por_rating.__wrapped__(
+            cubo, *filtro, tuple(generos), tuple(ratings[:8])
+        )
+
+    _medir("seccion_2", seccion_2, r)
+    _medir(
+        "seccion_3",
+        lambda: secciones.directores.__wrapped__(cubo, *filtro, TOP_N_AUTORES),
+        r,
+    )
+    _medir(
+        "seccion_4",
+        lambda: secciones.duracion_por_pais.__wrapped__(cubo, *filtro, paises),
+        r,
+    )
+    _medir(
+        "seccion_5",
+        lambda: secciones.tiempo_incorporacion.__wrapped__(cubo, *filtro),
+        r,
+    )
+
+    textos = datos.cargar_textos(ruta, directorio_cache=None)
+    grafo = _medir("grafo", lambda: construir_grafo(df, textos), r)
+    tendencias = _medir(
+        "tendencias",
+        lambda: construir_tendencias(df, puente_pais, puente_genero),
+        r,
+    )
+    _medir(
+        "seccion_7",
+        lambda: secciones.impulso.__wrapped__(
+            tendencias, "genero", TIPOS, *FECHAS, "mes", 12, TOP_N_GENEROS
+        ),
+        r,
+    )
+    _medir(
+        "seccion_6",
+        lambda: secciones.red_colaboraciones.__wrapped__(
+            grafo, indices, *filtro, TOP_N_AUTORES
+        ),
+        r,
+    )
+    indice_texto = _medir(
+        "indice_texto", lambda: construir_busqueda(df, textos), r
+    )
+    _medir(
+        "busqueda",
+        lambda: secciones.busqueda.__wrapped__(
+            indice_texto, df, indices, "love famil", *filtro
+        ),
+        r,
+    )
+    indice_similares = _medir(
+        "indice_similares",
+        lambda: construir_similares(df, puente_pais, puente_genero, textos),
+        r,
+    )
+    _medir(
+        "similares",
+        lambda: secciones.titulos_similares.__wrapped__(
+            indice_similares, df, indices, 0, *filtro
+        ),
+        r,
+    )
+    return r
+
+
+# ── Comparacion con la linea base ─────────────────────────────────────────────
+def regresiones(actual, base, tolerancia):
+    """Etapas cuyo tiempo o memoria supera la base en mas de `tolerancia`."""
+    peores = []
+    for escala, etapas in actual.items():
+        for etapa, medida in etapas.items():
+            previa = base.get(escala, {}).get(etapa)
+            if previa is None:
+                continue
+            for clave, minimo in MINIMO.items():
+                if medida[clave] > max(previa[clave], minimo) * (1 + tolerancia):
+                    peores.append((escala, etapa, clave, previa[clave], medida[clave]))
+    return peores
+
+
+def _tabla(actual, base):
+    filas = []
+    for escala, etapas in actual.items():
+        for etapa, medida in etapas.items():
+            previa = base.get(escala, {}).get(etapa, {})
+            filas.append(
+                {
+                    "escala": escala,
+                    "etapa": etapa,
+                    "segundos": medida["segundos"],
+                    "base_s": previa.get("segundos"),
+                    "pico_mb": medida["pico_mb"],
+                    "base_mb": previa.get("pico_mb"),
+                }
+            )
+    return pd.DataFrame(filas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--escalas", type=int, nargs="+", default=[1, 10])
+    parser.add_argument("--base", type=Path, default=RUTA_BASE)
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    parser.add_argument(
+        "--guardar", action="store_true", help="guarda los resultados como base"
+    )
+    args = parser.parse_args(argv)
+
+    actual = {}
+    with tempfile.TemporaryDirectory() as directorio:
+        for factor in args.escalas:
+            ruta = datos.RUTA_CATALOGO
+            if factor > 1:
+                ruta = escribir_sintetico(Path(directorio) / f"x{factor}.csv", factor)
+            actual[f"x{factor}"] = medir_pipeline(ruta)
+
+    base = json.loads(args.base.read_text()) if args.base.exists() else {}
+    with pd.option_context("display.width", 120, "display.float_format", "{:.3f}".format):
+        print(_tabla(actual, base).to_string(index=False))
+
+    if args.guardar:
+        args.base.write_text(json.dumps({**base, **actual}, indent=2))
+        return 0
+
+    peores = regresiones(actual, base, args.tolerancia)
+    for escala, etapa, clave, previa, medida in peores:
+        print(f"REGRESION {escala} {etapa} {clave}: {previa:.3f} → {medida:.3f}")
+    return 1 if peores else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
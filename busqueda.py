@@ -0,0 +1,157 @@
+"""Indice de texto completo sobre titulo, descripcion, reparto y director.
+
+Cada palabra (en minusculas y sin tildes) apunta a las filas que la
+contienen, con un peso que suma cuantas veces aparece y en que campo: el
+titulo pesa mas que la descripcion. Las consultas se responden uniendo e
+intersectando esas listas, igual que los filtros de `indices`, y el puntaje
+de cada fila es la suma de peso × idf de sus terminos.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from datos import SIN_PERSONA
+from indices import posiciones
+
+# Peso de una aparicion segun el campo
+PESOS = {"title": 3.0, "director": 2.0, "cast": 2.0, "description": 1.0}
+
+# vocabulario: palabras distintas, ordenadas
+# filas, pesos: filas con cada palabra (ordenadas) y su peso en esa fila
+# limites:     filas[limites[i]:limites[i + 1]] son las filas de vocabulario[i]
+IndiceTexto = namedtuple(
+    "IndiceTexto", ["vocabulario", "filas", "pesos", "limites", "n_filas"]
+)
+
+
+def palabras(textos):
+    """Palabras de cada texto: minusculas, sin tildes, solo letras y digitos.
+
+    Recibe un arreglo de textos y devuelve (fila, palabra) de todas las
+    apariciones. Todo corre en los kernels de Arrow, sin listas de Python.
+    """
+    texto = pa.array(textos, pa.large_string())
+    if isinstance(texto, pa.ChunkedArray):
+        # Columnas leidas de la cache llegan en trozos; `list_parent_indices`
+        # numera las filas dentro de cada trozo
+        texto = texto.combine_chunks()
+    texto = pc.utf8_normalize(pc.utf8_lower(texto), "NFKD")
+    texto = pc.replace_substring_regex(texto, r"\p{Mn}+", "")
+    texto = pc.replace_substring_regex(texto, r"[^a-z0-9]+", " ")
+    listas = pc.split_pattern(pc.utf8_trim_whitespace(texto), " ")
+    filas = pc.list_parent_indices(listas).to_numpy()
+    planas = pc.list_flatten(listas)
+    validas = pc.not_equal(planas, "").to_numpy(zero_copy_only=False)
+    return filas[validas], planas.filter(pa.array(validas))
+
+
+def construir_busqueda(df, textos):
+    """Indice de texto a partir del catalogo y sus columnas de texto libre."""
+    columnas = {"title": df["title"], "director": df["director"], **textos}
+    partes = []
+    for campo, peso in PESOS.items():
+        filas, encontradas = palabras(columnas[campo])
+        partes.append(
+            pd.DataFrame(
+                {
+                    "fila": filas.astype(np.int32),
+                    "palabra": pd.Series(encontradas, dtype="str"),
+                    "peso": np.float32(peso),
+                }
+            )
+        )
+    apariciones = pd.concat(partes, ignore_index=True)
+    # El valor imputado de director y reparto no es texto real
+    apariciones = apariciones[apariciones["palabra"] != SIN_PERSONA.lower()]
+
+    codigos, vocabulario = pd.factorize(apariciones["palabra"], sort=True)
+    por_fila = (
+        pd.DataFrame(
+            {
+                "codigo": codigos,
+                "fila": apariciones["fila"].to_numpy(),
+                "peso": apariciones["peso"].to_numpy(),
+            }
+        )
+        .groupby(["codigo", "fila"], sort=True)["peso"]
+        .sum()
+    )
+    limites = np.zeros(len(vocabulario) + 1, dtype=np.int64)
+    limites[1:] = np.cumsum(
+        np.bincount(
+            por_fila.index.get_level_values("codigo"), minlength=len(vocabulario)
+        )
+    )
+    return IndiceTexto(
+        # Arreglo de objetos: la busqueda binaria no convierte en cada consulta
+        vocabulario.to_numpy(dtype=object),
+        por_fila.index.get_level_values("fila").to_numpy(dtype=np.int32),
+        por_fila.to_numpy(dtype=np.float32),
+        limites,
+        len(df),
+    )
+
+
+# ── Consultas ─────────────────────────────────────────────────────────────────
+def terminos(consulta):
+    """Terminos de una consulta; el ultimo (o los que terminan en *) es prefijo.
+
+    Devuelve pares (termino, es_prefijo).
+    """
+    crudos = consulta.split()
+    resultado = []
+    for i, crudo in enumerate(crudos):
+        prefijo = crudo.endswith("*") or i == len(crudos) - 1
+        for palabra in palabras([crudo])[1].to_pylist():
+            resultado.append((palabra, prefijo))
+    return resultado
+
+
+def _filas_termino(indice, termino, prefijo):
+    """Filas con el termino y su puntaje (peso × idf), ordenadas por fila."""
+    vocabulario = indice.vocabulario
+    i = np.searchsorted(vocabulario, termino, side="left")
+    if prefijo:
+        j = np.searchsorted(vocabulario, termino + "\uffff", side="left")
+    else:
+        j = i + 1 if i < len(vocabulario) and vocabulario[i] == termino else i
+    if i == j:
+        return np.empty(0, dtype=np.int32), np.empty(0)
+
+    inicios, fines = indice.limites[i:j], indice.limites[i + 1:j + 1]
+    largos = fines - inicios
+    idf = np.log1p(indice.n_filas / largos)
+    tramos = posiciones(inicios, largos)
+    filas = indice.filas[tramos]
+    puntajes = indice.pesos[tramos] * np.repeat(idf, largos)
+    if j - i == 1:
+        return filas, puntajes
+    # Un prefijo abarca varias palabras: se suman por fila
+    filas, codigos = np.unique(filas, return_inverse=True)
+    return filas, np.bincount(codigos, weights=puntajes)
+
+
+def buscar(indice, consulta, filas=None, k=50):
+    """Las `k` filas con mayor puntaje que contienen todos los terminos.
+
+    `filas` (ordenadas) restringe el resultado, por ejemplo a las filas que
+    pasan los filtros del panel. Devuelve (filas, puntajes) de mayor a menor.
+    """
+    resultado, puntaje = filas, None
+    for termino, prefijo in terminos(consulta):
+        encontradas, puntos = _filas_termino(indice, termino, prefijo)
+        if resultado is not None:
+            comunes = np.isin(encontradas, resultado, assume_unique=True)
+            encontradas, puntos = encontradas[comunes], puntos[comunes]
+            if puntaje is not None:
+                puntos = puntos + puntaje[np.isin(resultado, encontradas)]
+        resultado, puntaje = encontradas, puntos
+        if not len(resultado):
+            break
+    if puntaje is None:
+        return np.empty(0, dtype=np.int32), np.empty(0)
+    orden = np.argsort(-puntaje, kind="stable")[:k]
+    return resultado[orden], puntaje[orden]
@@ -0,0 +1,115 @@
+"""Comparacion de varios catalogos (por region o por mes) en un solo cubo.
+
+Cada CSV pasa por la misma limpieza que el catalogo principal y deja su cubo
+en la cache en disco (`datos.cargar_cubo`): los que faltan se procesan en
+paralelo, uno por proceso, y los que ya estaban solo se leen. Agregar un
+catalogo cuesta entonces un parseo y una pasada de agregacion.
+
+Los cubos se apilan con una dimension mas, `catalogo`, y categorias comunes
+(la union de las de cada uno). Las consultas de `secciones` rebanan y
+enrollan el cubo apilado una sola vez para todos los catalogos, y
+`alinear` completa con ceros lo que a un catalogo le falta, de modo que
+las vistas lado a lado y de diferencias comparan las mismas categorias.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import datos
+from cubo import CUBOIDES
+
+
+def rutas_catalogos(texto):
+    """Rutas separadas por `os.pathsep`; un directorio aporta sus `.csv`."""
+    rutas = []
+    for parte in filter(None, texto.split(os.pathsep)):
+        ruta = Path(parte)
+        rutas.extend(sorted(ruta.glob("*.csv")) if ruta.is_dir() else [ruta])
+    return [str(r) for r in rutas]
+
+
+def etiquetas(rutas):
+    """Nombre corto de cada catalogo: el del archivo, o la ruta si se repite."""
+    nombres = [Path(r).stem for r in rutas]
+    if len(set(nombres)) < len(nombres):
+        return [str(r) for r in rutas]
+    return nombres
+
+
+def _preparar(ruta):
+    # Deja catalogo y cubo en la cache; el resultado se lee desde ahi
+    datos.cargar_cubo(ruta)
+
+
+def apilar_cubos(cubos):
+    """Un cubo con la dimension `catalogo` a partir de {etiqueta: cubo}.
+
+    Las categorias de cada dimension pasan a ser la union de las de todos
+    los catalogos y las celdas quedan ordenadas por año, como en cada cubo,
+    para que `rebanar` siga tomando un tramo contiguo.
+    """
+    apilado = {}
+    for nombre in CUBOIDES:
+        celdas = datos.concatenar(
+            [cubo[nombre].assign(catalogo=e) for e, cubo in cubos.items()]
+        )
+        celdas["catalogo"] = pd.Categorical(celdas["catalogo"], categories=list(cubos))
+        orden = np.argsort(celdas["release_year"].to_numpy(), kind="stable")
+        apilado[nombre] = celdas.iloc[orden].reset_index(drop=True)
+    return apilado
+
+
+def cargar_catalogos(rutas, procesos=None, mapear=False):
+    """Cubo apilado de los catalogos `rutas` (ver `apilar_cubos`).
+
+    Los CSV sin cubo en la cache se procesan en paralelo con hasta
+    `procesos` procesos (por defecto, uno por CPU).
+    """
+    pendientes = [r for r in rutas if not datos.cubo_en_cache(r)]
+    procesos = min(procesos or os.cpu_count(), len(pendientes))
+    if procesos > 1:
+        with ProcessPoolExecutor(procesos) as ejecutor:
+            list(ejecutor.map(_preparar, pendientes))
+    cubos = {
+        etiqueta: datos.cargar_cubo(ruta, mapear=mapear)
+        for etiqueta, ruta in zip(etiquetas(rutas), rutas)
+    }
+    return apilar_cubos(cubos)
+
+
+# ── Consultas ─────────────────────────────────────────────────────────────────
+def alinear(tabla, valores, catalogos):
+    """Completa `tabla` con todas las combinaciones de catalogo y categorias.
+
+    Lo que un catalogo no tiene queda en 0 en los conteos (NA en los demas
+    `valores`) y las claves pasan a texto, con los catalogos en su orden.
+    """
+    claves = [c for c in tabla.columns if c not in valores]
+    conteos = [c for c in valores if pd.api.types.is_integer_dtype(tabla[c])]
+    tabla = tabla.astype({c: str for c in claves})
+    niveles = [
+        catalogos if c == "catalogo" else sorted(tabla[c].unique()) for c in claves
+    ]
+    completo = pd.MultiIndex.from_product(niveles, names=claves)
+    tabla = tabla.set_index(claves).reindex(completo)
+    tabla[conteos] = tabla[conteos].fillna(0).astype(np.int64)
+    return tabla.reset_index()
+
+
+def diferencia(tabla, valor, referencia, valores=()):
+    """`valor` de cada catalogo menos el del catalogo `referencia`.
+
+    `tabla` debe estar alineada (ver `alinear`): cada combinacion de claves
+    aparece una vez por catalogo. Las columnas de `valores` no son claves y
+    se descartan, salvo `valor`. El catalogo de referencia sale del
+    resultado.
+    """
+    claves = [c for c in tabla.columns if c not in ("catalogo", valor, *valores)]
+    base = tabla.loc[tabla["catalogo"] == referencia, [*claves, valor]]
+    resto = tabla.loc[tabla["catalogo"] != referencia, ["catalogo", *claves, valor]]
+    resto = resto.merge(base, on=claves, suffixes=("", "_referencia"))
+    resto[valor] = resto[valor] - resto.pop(f"{valor}_referencia")
+    return resto
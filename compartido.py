@@ -0,0 +1,98 @@
+"""Estructuras derivadas del catalogo compartidas entre procesos por mmap.
+
+Los indices (`indices`, `busqueda`, `grafo`, `similares`) son diccionarios y
+namedtuples de arreglos de numpy. `estructura_compartida` los construye una
+sola vez por version del CSV, guarda cada arreglo como `.npy` en la cache en
+disco y los abre mapeados en memoria, de solo lectura: todos los procesos
+que atienden el panel leen las mismas paginas del cache del sistema, sin
+copiarlas ni reconstruirlas al arrancar.
+"""
+import importlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import datos
+
+MANIFIESTO = "estructura.json"
+
+
+def _guardar(valor, directorio, archivos):
+    """Descriptor JSON de `valor`; sus arreglos quedan en `directorio`."""
+    if isinstance(valor, dict):
+        return {
+            "dict": {k: _guardar(v, directorio, archivos) for k, v in valor.items()}
+        }
+    if isinstance(valor, tuple) and hasattr(valor, "_fields"):
+        tipo = type(valor)
+        return {
+            "tupla": f"{tipo.__module__}:{tipo.__qualname__}",
+            "campos": {
+                k: _guardar(v, directorio, archivos) for k, v in valor._asdict().items()
+            },
+        }
+    if isinstance(valor, (np.ndarray, pd.Index)):
+        arreglo = np.asarray(valor)
+        if arreglo.dtype == object:
+            # Texto de ancho fijo: se puede mapear, a diferencia de los objetos
+            arreglo = arreglo.astype(str)
+        nombre = f"{len(archivos)}.npy"
+        np.save(directorio / nombre, arreglo)
+        archivos.append(nombre)
+        return {"arreglo": nombre, "indice": isinstance(valor, pd.Index)}
+    return {"valor": valor.item() if isinstance(valor, np.generic) else valor}
+
+
+def _abrir(descriptor, directorio):
+    if "dict" in descriptor:
+        return {k: _abrir(d, directorio) for k, d in descriptor["dict"].items()}
+    if "tupla" in descriptor:
+        modulo, nombre = descriptor["tupla"].split(":")
+        tipo = getattr(importlib.import_module(modulo), nombre)
+        campos = descriptor["campos"]
+        return tipo(**{k: _abrir(d, directorio) for k, d in campos.items()})
+    if "arreglo" in descriptor:
+        arreglo = np.load(directorio / descriptor["arreglo"], mmap_mode="r")
+        # Vista ndarray del mapeo: las operaciones no devuelven `memmap`
+        arreglo = arreglo.view(np.ndarray)
+        return pd.Index(arreglo) if descriptor["indice"] else arreglo
+    return descriptor["valor"]
+
+
+def guardar_arreglos(valor, directorio):
+    """Guarda un dict/namedtuple de arreglos en `directorio` (que no debe existir)."""
+    directorio = Path(directorio)
+    directorio.mkdir(parents=True)
+    descriptor = _guardar(valor, directorio, [])
+    (directorio / MANIFIESTO).write_text(json.dumps(descriptor))
+
+
+def abrir_arreglos(directorio):
+    """Abre lo guardado con `guardar_arreglos`, con los arreglos mapeados."""
+    directorio = Path(directorio)
+    return _abrir(json.loads((directorio / MANIFIESTO).read_text()), directorio)
+
+
+def estructura_compartida(
+    nombre, construir, ruta=datos.RUTA_CATALOGO, directorio_cache=datos.DIRECTORIO_CACHE
+):
+    """`construir()` guardada una vez por version del CSV y abierta mapeada.
+
+    El primer proceso la construye y la publica renombrando un directorio
+    temporal (atomico); si otro proceso la publico antes, se descarta la
+    propia. Los demas solo la abren.
+    """
+    destino = Path(directorio_cache) / f"{datos.hash_archivo(ruta)}_{nombre}"
+    if not (destino / MANIFIESTO).exists():
+        temporal = destino.with_name(f"{destino.name}.{os.getpid()}.tmp")
+        shutil.rmtree(temporal, ignore_errors=True)
+        guardar_arreglos(construir(), temporal)
+        try:
+            os.rename(temporal, destino)
+        except OSError:
+            shutil.rmtree(temporal, ignore_errors=True)
+    return abrir_arreglos(destino)
@@ -0,0 +1,278 @@
+"""Cubo de conteos pre-agregado para los graficos del panel.
+
+El cubo se guarda como varios cuboides dispersos (solo celdas no vacias), cada
+uno con las dimensiones que necesita una seccion. Todos empiezan por
+`release_year` y `type` y estan ordenados por año, asi que un rango de años es
+un tramo contiguo. Cada grafico se obtiene rebanando ese tramo y enrollando
+(sumando) las dimensiones que no muestra: el costo depende de las celdas de
+la seleccion, no de la cantidad de titulos.
+
+Las medidas numericas (`duracion_min`, `años_diferencia`) se guardan como
+histograma por celda (el valor es una dimension mas), de modo que conteo,
+suma, suma de cuadrados y mediana se calculan de forma exacta al enrollar.
+"""
+import numpy as np
+import pandas as pd
+
+DIMENSIONES_BASE = ["release_year", "type"]
+
+CUBOIDES = ("pais_genero", "rating_genero", "director", "duracion", "tiempo")
+
+
+def _cuboide(celdas, dimensiones):
+    """Agrupa filas en celdas (n = titulos, primera = primera fila)."""
+    return (
+        celdas.groupby(DIMENSIONES_BASE + dimensiones, observed=True, sort=True)
+        .agg(n=("fila", "size"), primera=("fila", "min"))
+        .reset_index()
+    )
+
+
+def construir_cubo(df, puente_pais, puente_genero, desplazamiento=0):
+    """Cuboides de las secciones 1 a 5 a partir del catalogo y los puentes.
+
+    `desplazamiento` es la posicion de la primera fila de `df` dentro del
+    catalogo completo cuando se construye por bloques.
+    """
+    base = pd.DataFrame(
+        {
+            "fila": np.arange(len(df), dtype=np.int32),
+            "release_year": df["release_year"].to_numpy(),
+            "type": pd.Categorical(df["type"]),
+        }
+    )
+
+    def con_base(puente):
+        return puente.merge(base, on="fila")
+
+    pais_genero = puente_pais.merge(puente_genero, on="fila")
+
+    directores = base.assign(
+        director=pd.Categorical(df["director"]),
+        rating=pd.Categorical(df["rating"]),
+    )
+
+    con_duracion = df["duracion_min"].notna().to_numpy()
+    duracion = con_base(puente_pais).assign(
+        duracion_min=lambda t: df["duracion_min"].to_numpy(
+            dtype="float64", na_value=np.nan
+        )[t["fila"].to_numpy()]
+    )
+    duracion = duracion[con_duracion[duracion["fila"].to_numpy()]]
+
+    tiempo = base.assign(
+        años_diferencia=df["años_diferencia"].to_numpy(
+            dtype="float64", na_value=np.nan
+        )
+    ).dropna(subset=["años_diferencia"])
+
+    cubo = {
+        "pais_genero": _cuboide(con_base(pais_genero), ["country_list", "genre_list"]),
+        "rating_genero": _cuboide(
+            con_base(puente_genero).assign(
+                rating=lambda t: pd.Categorical(df["rating"])[t["fila"].to_numpy()]
+            ),
+            ["rating", "genre_list"],
+        ),
+        "director": _cuboide(directores, ["director", "rating"]),
+        "duracion": _cuboide(duracion, ["country_list", "duracion_min"]),
+        "tiempo": _cuboide(tiempo, ["años_diferencia"]),
+    }
+    for cuboide in cubo.values():
+        cuboide["primera"] += desplazamiento
+    return cubo
+
+
+def combinar_cubos(cubos):
+    """Suma celda a celda varios cubos con las mismas dimensiones.
+
+    Los conteos pueden ser negativos (para restar filas); las celdas que
+    quedan en cero se descartan.
+    """
+    combinado = {}
+    for nombre in CUBOIDES:
+        partes = [c[nombre] for c in cubos]
+        dimensiones = [col for col in partes[0].columns if col not in ("n", "primera")]
+        celdas = pd.concat(partes, ignore_index=True)
+        for col in dimensiones:
+            if celdas[col].dtype == object or isinstance(
+                partes[0][col].dtype, pd.CategoricalDtype
+            ):
+                celdas[col] = celdas[col].astype("category")
+        celdas = (
+            celdas.groupby(dimensiones, observed=True, sort=True)
+            .agg(n=("n", "sum"), primera=("primera", "min"))
+            .reset_index()
+        )
+        combinado[nombre] = celdas[celdas["n"] > 0].reset_index(drop=True)
+    return combinado
+
+
+# ── Consultas ─────────────────────────────────────────────────────────────────
+def rebanar(cuboide, tipos, año_min, año_max):
+    """Celdas del cuboide dentro del rango de años y de los tipos elegidos."""
+    años = cuboide["release_year"].to_numpy()
+    i = np.searchsorted(años, año_min, side="left")
+    j = np.searchsorted(años, año_max, side="right")
+    celdas = cuboide.iloc[i:j]
+    return celdas[celdas["type"].isin(tipos)]
+
+
+def enrollar(celdas, dimensiones, nombre="n"):
+    """Suma los conteos sobre todas las dimensiones salvo `dimensiones`."""
+    return (
+        celdas.groupby(dimensiones, observed=True, sort=True)["n"]
+        .sum()
+        .reset_index(name=nombre)
+    )
+
+
+def ranking(celdas, dimension):
+    """Conteo por valor de `dimension`, de mayor a menor.
+
+    Los empates se ordenan por primera aparicion en el catalogo, igual que
+    `value_counts()` sobre las filas originales.
+    """
+    totales = celdas.groupby(dimension, observed=True).agg(
+        n=("n", "sum"), primera=("primera", "min")
+    )
+    return totales.sort_values(["n", "primera"], ascending=[False, True])["n"]
+
+
+def acotar(celdas, dimension, k, otros="Otros"):
+    """Deja las `k` categorias con mas titulos y suma el resto en `otros`."""
+    if celdas[dimension].nunique() <= k:
+        return celdas
+    principales = ranking(celdas, dimension).index[:k]
+    resto = ~celdas[dimension].isin(principales)
+    if not resto.any():
+        return celdas
+    etiquetas = celdas[dimension].astype(str).where(~resto, otros)
+    return celdas.assign(**{dimension: etiquetas})
+
+
+# ── Momentos y cuantiles ──────────────────────────────────────────────────────
+# Cada celda de los cuboides `duracion` y `tiempo` es un bocado de histograma
+# (valor, n) de una celda (año, tipo[, pais]). Los bocados se combinan
+# sumando conteos, sin perder informacion: como las medidas son enteras (un
+# valor por minuto o por año), el histograma de cualquier seleccion es exacto
+# y su tamaño esta acotado por la cantidad de valores distintos, no de
+# titulos. Los momentos y cuantiles de cada grupo se obtienen de una sola
+# pasada vectorizada sobre las celdas, sin volver a las filas.
+def _grupos(celdas, por):
+    """Numero de grupo por celda y claves de cada grupo (ordenadas)."""
+    agrupado = celdas.groupby(por, observed=True, sort=True)
+    claves = agrupado.size().reset_index()[por]
+    for col in por:
+        if isinstance(claves[col].dtype, pd.CategoricalDtype):
+            claves[col] = claves[col].astype(str)
+    return agrupado.ngroup().to_numpy(), claves
+
+
+def momentos(celdas, por, valor, agrupado=None):
+    """Conteo, promedio y suma de cuadrados centrada de `valor` por grupo.
+
+    Equivale a combinar los acumuladores (n, promedio, M2) de cada celda con
+    la formula de Chan: M2 = Σ M2_i + Σ n_i (promedio_i - promedio)².
+    `agrupado` reutiliza el resultado de `_grupos` entre llamadas.
+    """
+    grupos, claves = agrupado or _grupos(celdas, por)
+    valores = celdas[valor].to_numpy(dtype="float64")
+    conteos = celdas["n"].to_numpy(dtype="float64")
+    n = np.bincount(grupos, weights=conteos, minlength=len(claves))
+    suma = np.bincount(grupos, weights=conteos * valores, minlength=len(claves))
+    promedio = suma / n
+    m2 = np.bincount(
+        grupos,
+        weights=conteos * (valores - promedio[grupos]) ** 2,
+        minlength=len(claves),
+    )
+    return claves.assign(n=n.astype(np.int64), promedio=promedio, m2=m2)
+
+
+def cuantiles(celdas, por, valor, probabilidades, agrupado=None):
+    """Cuantiles de `valor` por grupo, con interpolacion lineal (numpy).
+
+    Las celdas se ordenan por (grupo, valor) y cada cuantil se ubica con una
+    busqueda binaria sobre los conteos acumulados de todos los grupos.
+    """
+    grupos, claves = agrupado or _grupos(celdas, por)
+    valores = celdas[valor].to_numpy(dtype="float64")
+    orden = np.lexsort((valores, grupos))
+    grupos, valores = grupos[orden], valores[orden]
+    conteos = celdas["n"].to_numpy(dtype="int64")[orden]
+    acumulado = np.cumsum(conteos)
+    n = np.bincount(grupos, weights=conteos, minlength=len(claves)).astype(np.int64)
+    inicio = np.cumsum(n) - n
+
+    def rango(k):
+        # Valor en la posicion k (0 = menor) de cada grupo
+        i = np.searchsorted(acumulado, inicio + k, side="right")
+        return valores[np.minimum(i, len(valores) - 1)]
+
+    resultado = claves.copy()
+    for p in probabilidades:
+        posicion = (n - 1) * p
+        abajo = np.floor(posicion)
+        fraccion = posicion - abajo
+        valor_abajo = rango(abajo)
+        arriba = np.minimum(abajo + 1, n - 1)
+        resultado[p] = valor_abajo + fraccion * (rango(arriba) - valor_abajo)
+    return resultado
+
+
+def resumen_histograma(celdas, por, valor):
+    """Conteo, promedio, mediana y desviacion de `valor` por grupo `por`.
+
+    Exactos: coinciden con `mean`, `median` y `std` sobre las filas.
+    """
+    agrupado = _grupos(celdas, por)
+    resumen = momentos(celdas, por, valor, agrupado)
+    n = resumen["n"].to_numpy()
+    with np.errstate(invalid="ignore", divide="ignore"):
+        desviacion = np.sqrt(np.where(n > 1, resumen["m2"] / (n - 1), np.nan))
+    return resumen[por].assign(
+        cantidad=n,
+        promedio=resumen["promedio"],
+        mediana=cuantiles(celdas, por, valor, [0.5], agrupado)[0.5],
+        desviacion=desviacion,
+    )
+
+
+def resumen_caja(celdas, por, valor, max_atipicos=50):
+    """Estadisticos de un diagrama de caja de `valor` por grupo `por`.
+
+    Cuartiles con interpolacion lineal, bigotes en el ultimo valor dentro de
+    1.5 veces el rango intercuartil (como plotly) y a lo sumo `max_atipicos`
+    valores atipicos distintos por grupo, los mas alejados de la mediana.
+    """
+    agrupado = _grupos(celdas, por)
+    resumen = cuantiles(celdas, por, valor, [0.25, 0.5, 0.75], agrupado).rename(
+        columns={0.25: "q1", 0.5: "mediana", 0.75: "q3"}
+    )
+    acumulados = momentos(celdas, por, valor, agrupado)
+    resumen["promedio"] = acumulados["promedio"]
+    # Desviacion poblacional, la que plotly dibuja con boxmean="sd"
+    resumen["desviacion"] = np.sqrt(acumulados["m2"] / acumulados["n"])
+
+    # Bigotes y atipicos: un recorrido por los valores distintos de cada grupo
+    grupos = agrupado[0]
+    valores = celdas[valor].to_numpy(dtype="float64")
+    minimos, maximos, atipicos = [], [], []
+    for g, caja in enumerate(resumen.itertuples(index=False)):
+        distintos = np.unique(valores[grupos == g])
+        rango = caja.q3 - caja.q1
+        dentro = (distintos >= caja.q1 - 1.5 * rango) & (
+            distintos <= caja.q3 + 1.5 * rango
+        )
+        fuera = distintos[~dentro]
+        fuera = fuera[np.argsort(-np.abs(fuera - caja.mediana), kind="stable")]
+        minimos.append(distintos[dentro].min())
+        maximos.append(distintos[dentro].max())
+        atipicos.append(tuple(np.sort(fuera[:max_atipicos]).tolist()))
+    resumen["minimo"], resumen["maximo"] = minimos, maximos
+    resumen["atipicos"] = atipicos
+    columnas = ["q1", "mediana", "q3", "minimo", "maximo", "promedio", "desviacion"]
+    return resumen[list(por) + columnas + ["atipicos"]]
+
+
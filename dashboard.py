@@ -1,9 +1,24 @@
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 import streamlit as st
 import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
 from collections import Counter
 
+import comparacion
+import datos
+import figuras
+import memo
+import perfil
+import secciones
+from busqueda import construir_busqueda
+from compartido import estructura_compartida
+from grafo import construir_grafo
+from indices import construir_indices
+from similares import construir_similares
+from tendencias import construir_tendencias
+
 # ── Configuración de la página ────────────────────────────────────────────────
 st.set_page_config(
     page_title="Netflix – Análisis Exploratorio de Datos",
@@ -54,80 +69,167 @@ st.markdown(
     unsafe_allow_html=True,
 )
 
-# ── Paleta de colores neutral y profesional ───────────────────────────────────
-PALETTE = [
-    "#c0392b", "#2c3e50", "#7f8c8d", "#1a6b8a",
-    "#8e6dbf", "#2980b9", "#e67e22", "#27ae60",
-    "#d35400", "#16a085",
-]
-
 # ── Carga y preparación de datos ─────────────────────────────────────────────
-@st.cache_data
-def cargar_datos():
-    df = pd.read_csv("netflix_titles.csv")
-
-    # Imputación (reproduciendo el EDA)
-    df["director"] = df["director"].fillna("Desconocido")
-    df["cast"] = df["cast"].fillna("Desconocido")
-    df["country"] = df["country"].fillna("Otros")
-    df.dropna(subset=["date_added", "rating", "duration"], inplace=True)
-
-    # Columna año de incorporación a Netflix
-    df["year_added"] = (
-        pd.to_datetime(df["date_added"], format="%B %d, %Y", errors="coerce")
-        .dt.year.astype("Int64")
+# cache_resource: un solo catalogo (de solo lectura) compartido por todas las
+# sesiones, sin copiarlo ni deserializarlo en cada rerun
+# NETFLIX_TAMANO_BLOQUE > 0 procesa el CSV por bloques de ese numero de filas
+TAMAÑO_BLOQUE = int(os.environ.get("NETFLIX_TAMANO_BLOQUE", "0")) or None
+# NETFLIX_HILOS > 0 calcula las secciones en paralelo con ese numero de hilos
+HILOS = int(os.environ.get("NETFLIX_HILOS", "0"))
+# NETFLIX_COMPARTIDO=1: los procesos del servidor mapean el catalogo y sus
+# indices desde la cache en disco en lugar de tener cada uno su copia
+COMPARTIDO = os.environ.get("NETFLIX_COMPARTIDO") == "1"
+# NETFLIX_CATALOGOS: CSV que compara la seccion 8 (instantaneas por region o
+# por mes), separados por ":" o como un directorio que los contiene
+CATALOGOS = comparacion.rutas_catalogos(os.environ.get("NETFLIX_CATALOGOS", ""))
+
+# Las cargas se indexan por la version del CSV (tamaño y fecha de
+# modificacion): si el archivo crece, el siguiente rerun solo procesa lo nuevo
+version = datos.version_archivo(datos.RUTA_CATALOGO)
+
+
+def derivada(nombre, construir):
+    """`construir()`, o la copia compartida entre procesos en modo compartido."""
+    if COMPARTIDO:
+        return estructura_compartida(nombre, construir)
+    return construir()
+
+
+def cargar_textos():
+    return datos.cargar_textos(datos.RUTA_CATALOGO, mapear=COMPARTIDO)
+
+
+@st.cache_resource(max_entries=1)
+def cargar_datos(version):
+    return datos.cargar_catalogo(
+        datos.RUTA_CATALOGO, tamaño_bloque=TAMAÑO_BLOQUE, mapear=COMPARTIDO
     )
 
-    # Diferencia de años
-    df["años_diferencia"] = df["year_added"] - df["release_year"]
 
-    # Duración numérica para películas
-    df["duracion_min"] = (
-        df["duration"]
-        .str.extract(r"(\d+)\s*min")[0]
-        .astype(float)
+@st.cache_resource(max_entries=1)
+def cargar_indices(version):
+    return derivada("indices", lambda: construir_indices(*cargar_datos(version)))
+
+
+@st.cache_resource(max_entries=1)
+def cargar_cubo(version):
+    cargar_datos(version)  # la ingesta por bloques o incremental genera el cubo
+    return datos.cargar_cubo(datos.RUTA_CATALOGO, mapear=COMPARTIDO)
+
+
+# Perfilado opcional: NETFLIX_PERFIL=1 o ?perfil=1 en la URL
+perf = perfil.Perfil(
+    activo=os.environ.get("NETFLIX_PERFIL") == "1"
+    or st.query_params.get("perfil") == "1",
+    sesion=st.session_state.setdefault("sesion", uuid.uuid4().hex),
+)
+
+# Reruns de la sesion por motivo, contados al empezar para incluir los que
+# se interrumpen (ver `perf.cerrar`)
+reruns = st.session_state.setdefault("reruns", Counter())
+motivo = st.session_state.pop("motivo_rerun", "interaccion" if reruns else "inicio")
+reruns[motivo] += 1
+
+
+def contar_aplicacion(formulario):
+    """Marca el proximo rerun como disparado por `formulario`."""
+    st.session_state["motivo_rerun"] = formulario
+
+
+def grafico(nombre, construir, *args):
+    """Construye (o toma de la cache) una figura y la dibuja, midiendo ambas."""
+    fig = perf.medir(f"{nombre}.figura", figuras.cacheada, construir, *args)
+    with perf.etapa(f"{nombre}.render"):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+@st.cache_resource(max_entries=1)
+def cargar_busqueda(version):
+    df = cargar_datos(version)[0]
+    return derivada("busqueda", lambda: construir_busqueda(df, cargar_textos()))
+
+
+@st.cache_resource(max_entries=1)
+def cargar_similares(version):
+    catalogo = cargar_datos(version)
+    return derivada(
+        "similares", lambda: construir_similares(*catalogo, cargar_textos())
     )
 
-    return df
 
-df = cargar_datos()
+@st.cache_resource(max_entries=1)
+def cargar_grafo(version):
+    df = cargar_datos(version)[0]
+    return derivada("grafo", lambda: construir_grafo(df, cargar_textos()))
+
+
+@st.cache_resource(max_entries=1)
+def cargar_tendencias(version):
+    catalogo = cargar_datos(version)
+    return derivada("tendencias", lambda: construir_tendencias(*catalogo))
+
+
+@st.cache_resource(max_entries=1)
+def cargar_comparacion(versiones):
+    # Solo se procesan los catalogos nuevos o modificados (ver `comparacion`)
+    return comparacion.cargar_catalogos(CATALOGOS, mapear=COMPARTIDO)
+
+
+@st.cache_resource(max_entries=1)
+def cargar_cuarentena(version):
+    cargar_datos(version)  # la validacion corre durante la carga
+    return datos.cargar_cuarentena(datos.RUTA_CATALOGO)
+
+
+@st.cache_resource
+def crear_ejecutor():
+    return ThreadPoolExecutor(HILOS, thread_name_prefix="seccion") if HILOS else None
+
+
+df, puente_pais, puente_genero = perf.medir("carga", cargar_datos, version)
+indices = perf.medir("indices", cargar_indices, version)
+cubo = perf.medir("cubo", cargar_cubo, version)
 
 # ── Barra lateral ─────────────────────────────────────────────────────────────
+# Los filtros van en formularios: mover un slider o editar una lista no
+# dispara reruns intermedios, y el panel se recalcula una sola vez al
+# aplicar
 with st.sidebar:
     st.markdown("## Filtros")
     st.markdown("---")
 
-    tipo_contenido = st.multiselect(
-        "Tipo de contenido",
-        options=df["type"].unique().tolist(),
-        default=df["type"].unique().tolist(),
-    )
+    with st.form("filtros", border=False):
+        tipo_contenido = st.multiselect(
+            "Tipo de contenido",
+            options=df["type"].unique().tolist(),
+            default=df["type"].unique().tolist(),
+        )
 
-    años_disponibles = sorted(df["release_year"].dropna().unique().tolist())
-    rango_años = st.slider(
-        "Año de lanzamiento",
-        min_value=int(min(años_disponibles)),
-        max_value=int(max(años_disponibles)),
-        value=(2000, int(max(años_disponibles))),
-    )
+        años_disponibles = sorted(df["release_year"].dropna().unique().tolist())
+        rango_años = st.slider(
+            "Año de lanzamiento",
+            min_value=int(min(años_disponibles)),
+            max_value=int(max(años_disponibles)),
+            value=(2000, int(max(años_disponibles))),
+        )
 
-    paises_top = (
-        df["country"]
-        .str.split(",")
-        .explode()
-        .str.strip()
-        .value_counts()
-        .head(30)
-        .index.tolist()
-    )
-    paises_selec = st.multiselect(
-        "Paises (análisis geográfico)",
-        options=paises_top,
-        default=paises_top[:10],
-    )
+        paises_top = secciones.paises_principales(puente_pais, 30)
+        paises_selec = st.multiselect(
+            "Paises (análisis geográfico)",
+            options=paises_top,
+            default=paises_top[:10],
+        )
+
+        top_n_generos = st.slider("Numero de generos a mostrar", 5, 20, 10)
+        top_n_autores = st.slider("Numero de directores a mostrar", 5, 20, 10)
 
-    top_n_generos = st.slider("Numero de generos a mostrar", 5, 20, 10)
-    top_n_autores = st.slider("Numero de directores a mostrar", 5, 20, 10)
+        st.form_submit_button(
+            "Aplicar filtros",
+            type="primary",
+            use_container_width=True,
+            on_click=contar_aplicacion,
+            args=("filtros",),
+        )
 
     st.markdown("---")
     st.markdown(
@@ -136,10 +238,10 @@ with st.sidebar:
     )
 
 # ── Filtro base ───────────────────────────────────────────────────────────────
-df_filtrado = df[
-    df["type"].isin(tipo_contenido)
-    & df["release_year"].between(rango_años[0], rango_años[1])
-]
+# Argumentos comunes de las funciones de seccion (tipos, año minimo, maximo)
+filtro = (tuple(tipo_contenido), rango_años[0], rango_años[1])
+
+ejecutor = crear_ejecutor()
 
 # ── Encabezado ────────────────────────────────────────────────────────────────
 st.markdown("# Analisis Exploratorio de Datos – Catalogo Netflix")
@@ -152,497 +254,586 @@ st.markdown("---")
 
 # ── Metricas resumen ──────────────────────────────────────────────────────────
 col1, col2, col3, col4 = st.columns(4)
-col1.metric("Total de titulos", f"{len(df_filtrado):,}")
-col2.metric("Peliculas", f"{(df_filtrado['type'] == 'Movie').sum():,}")
-col3.metric("Series de TV", f"{(df_filtrado['type'] == 'TV Show').sum():,}")
-col4.metric(
-    "Paises con produccion",
-    df_filtrado["country"].str.split(",").explode().str.strip().nunique(),
+resumen = perf.medir(
+    "metricas", secciones.metricas, indices, puente_pais, *filtro
 )
+col1.metric("Total de titulos", f"{resumen['titulos']:,}")
+col2.metric("Peliculas", f"{resumen['peliculas']:,}")
+col3.metric("Series de TV", f"{resumen['series']:,}")
+col4.metric("Paises con produccion", resumen["paises"])
 
 st.markdown("---")
 
+# ── Buscador ──────────────────────────────────────────────────────────────────
+consulta = st.text_input(
+    "Buscar titulos",
+    placeholder="Titulo, descripcion, reparto o director (ej.: stranger thi)",
+    key="consulta",
+)
+if consulta.strip():
+    # El indice de texto se arma en la primera busqueda y queda en cache
+    indice_texto = perf.medir("indice_texto", cargar_busqueda, version)
+    encontrados = perf.medir(
+        "busqueda",
+        secciones.busqueda,
+        indice_texto,
+        df,
+        indices,
+        consulta,
+        *filtro,
+    )
+    st.caption(f"{len(encontrados)} resultados (maximo 50) dentro de los filtros")
+    st.dataframe(encontrados, use_container_width=True, hide_index=True)
+
+    # Recomendaciones a partir de uno de los resultados
+    referencia = st.selectbox(
+        "Titulos similares a",
+        options=encontrados.index.tolist(),
+        format_func=lambda fila: df["title"].iat[fila],
+        index=None,
+        placeholder="Elige un resultado",
+        key="referencia_similares",
+    )
+    if referencia is not None:
+        indice_similares = perf.medir("indice_similares", cargar_similares, version)
+        st.dataframe(
+            perf.medir(
+                "titulos_similares",
+                secciones.titulos_similares,
+                indice_similares,
+                df,
+                indices,
+                referencia,
+                *filtro,
+            ),
+            use_container_width=True,
+            hide_index=True,
+        )
+    st.markdown("---")
+
+# ── Secciones ─────────────────────────────────────────────────────────────────
+# Pestañas perezosas: solo la abierta prepara sus datos y arma sus graficos,
+# de modo que cada interaccion cuesta lo que se esta mirando. Los resultados
+# quedan en cache por filtros y volver a una pestaña ya vista es inmediato
+tab1, tab2, tab3, tab3b, tab4, tab5, tab6, tab7, tab8 = st.tabs(
+    [
+        "1. Generos por pais",
+        "2. Generos por clasificacion",
+        "3. Directores por año",
+        "3b. Director y clasificacion",
+        "4. Duracion por pais",
+        "5. Tiempo de incorporacion",
+        "6. Colaboraciones",
+        "7. Tendencias",
+        "8. Comparacion de catalogos",
+    ],
+    key="seccion",
+    on_change="rerun",
+)
+
+# El grafo de personas solo lo usa la seccion 6: se carga al abrirla
+grafo_personas = perf.medir("grafo", cargar_grafo, version) if tab6.open else None
+
+# Las secciones abiertas se lanzan juntas y cada una se dibuja en cuanto su
+# resultado esta listo
+# Un rerun nuevo reemplaza al anterior de la sesion (Streamlit lo interrumpe
+# con `runner.fastReruns`): lo que este dejo en cola ya no se va a mostrar
+secciones.cancelar(st.session_state.get("pendientes", {}).values())
+pendientes = {
+    nombre: secciones.lanzar(ejecutor, funcion, *args)
+    for nombre, funcion, args, pestañas in [
+        (
+            "generos_por_pais",
+            secciones.generos_por_pais,
+            (cubo, *filtro, tuple(paises_selec), top_n_generos),
+            [tab1],
+        ),
+        (
+            "opciones_rating",
+            secciones.opciones_rating,
+            (cubo, *filtro, top_n_generos),
+            [tab2],
+        ),
+        (
+            "directores",
+            secciones.directores,
+            (cubo, *filtro, top_n_autores),
+            [tab3, tab3b],
+        ),
+        (
+            "duracion_por_pais",
+            secciones.duracion_por_pais,
+            (cubo, *filtro, tuple(paises_selec)),
+            [tab4],
+        ),
+        (
+            "tiempo_incorporacion",
+            secciones.tiempo_incorporacion,
+            (cubo, *filtro),
+            [tab5],
+        ),
+        (
+            "red_colaboraciones",
+            secciones.red_colaboraciones,
+            (grafo_personas, indices, *filtro, top_n_autores),
+            [tab6],
+        ),
+    ]
+    if any(p.open for p in pestañas)
+    and (paises_selec or nombre != "generos_por_pais")
+}
+st.session_state["pendientes"] = pendientes
+
 # ══════════════════════════════════════════════════════════════════════════════
 # SECCION 1 – Generos mas populares por pais
 # ══════════════════════════════════════════════════════════════════════════════
-st.markdown("## 1. Generos mas populares por pais")
-st.markdown(
-    "Se expande la columna `listed_in` (que contiene multiples generos por "
-    "titulo) y se cruza con la columna `country` para identificar cuales generos "
-    "predominan en cada pais seleccionado."
-)
+with tab1:
+    if tab1.open:
+        st.markdown("## 1. Generos mas populares por pais")
+        st.markdown(
+            "Se expande la columna `listed_in` (que contiene multiples generos por "
+            "titulo) y se cruza con la columna `country` para identificar cuales "
+            "generos predominan en cada pais seleccionado."
+        )
 
-# Expandir paises y generos
-df_exp_pais = df_filtrado.copy()
-df_exp_pais["country_list"] = df_exp_pais["country"].str.split(",")
-df_exp_pais = df_exp_pais.explode("country_list")
-df_exp_pais["country_list"] = df_exp_pais["country_list"].str.strip()
-df_exp_pais["genre_list"] = df_exp_pais["listed_in"].str.split(",")
-df_exp_pais = df_exp_pais.explode("genre_list")
-df_exp_pais["genre_list"] = df_exp_pais["genre_list"].str.strip()
-
-if paises_selec:
-    df_pais_filt = df_exp_pais[df_exp_pais["country_list"].isin(paises_selec)]
-    heatmap_data = (
-        df_pais_filt.groupby(["country_list", "genre_list"])
-        .size()
-        .reset_index(name="cantidad")
-    )
+        if paises_selec:
+            pivot = perf.medir(
+                "generos_por_pais", pendientes["generos_por_pais"].result
+            )
 
-    # Top géneros globales para eje
-    top_generos_global = (
-        heatmap_data.groupby("genre_list")["cantidad"]
-        .sum()
-        .nlargest(top_n_generos)
-        .index.tolist()
-    )
-    heatmap_data = heatmap_data[heatmap_data["genre_list"].isin(top_generos_global)]
-    pivot = heatmap_data.pivot_table(
-        index="country_list", columns="genre_list", values="cantidad", fill_value=0
-    )
+            grafico("fig1", figuras.generos_pais, pivot)
+        else:
+            st.info("Selecciona al menos un pais en el panel lateral.")
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SECCION 2 – Generos mas populares por rating
+# ══════════════════════════════════════════════════════════════════════════════
+with tab2:
+    if tab2.open:
+        st.markdown("## 2. Generos mas populares por clasificacion de audiencia")
+        st.markdown(
+            "Se muestra la concentracion de generos segun la clasificacion de "
+            "audiencia (`rating`). El grafico permite identificar que tipo de "
+            "contenido predomina en cada categoria de clasificacion."
+        )
 
-    fig1 = go.Figure(
-        data=go.Heatmap(
-            z=pivot.values,
-            x=pivot.columns.tolist(),
-            y=pivot.index.tolist(),
-            colorscale=[
-                [0, "#f7f8fa"],
-                [0.4, "#f5a9a0"],
-                [1, "#c0392b"],
-            ],
-            showscale=True,
-            colorbar=dict(title="Cantidad"),
+        generos_freq, ratings_disponibles = perf.medir(
+            "opciones_rating", pendientes["opciones_rating"].result
         )
-    )
-    fig1.update_layout(
-        title="Distribucion de generos por pais (mapa de calor)",
-        xaxis_title="Genero",
-        yaxis_title="Pais",
-        plot_bgcolor="#ffffff",
-        paper_bgcolor="#ffffff",
-        font=dict(family="Segoe UI", size=12, color="#333"),
-        margin=dict(l=20, r=20, t=50, b=20),
-        xaxis=dict(tickangle=-35),
-        height=480,
-    )
-    st.plotly_chart(fig1, use_container_width=True)
-else:
-    st.info("Selecciona al menos un pais en el panel lateral.")
+        with st.form("filtro_ratings", border=False):
+            ratings_sel = st.multiselect(
+                "Clasificaciones a incluir",
+                options=ratings_disponibles,
+                default=ratings_disponibles[:8],
+                key="ratings_sel",
+            )
+            st.form_submit_button(
+                "Aplicar", on_click=contar_aplicacion, args=("filtro_ratings",)
+            )
 
-st.markdown("---")
+        gen_rat = perf.medir(
+            "generos_por_rating",
+            secciones.generos_por_rating,
+            cubo,
+            *filtro,
+            tuple(generos_freq),
+            tuple(ratings_sel),
+        )
+
+        grafico("fig2", figuras.generos_rating, gen_rat)
 
 # ══════════════════════════════════════════════════════════════════════════════
-# SECCION 2 – Generos mas populares por rating
+# SECCION 3 – Directores por año de lanzamiento
 # ══════════════════════════════════════════════════════════════════════════════
-st.markdown("## 2. Generos mas populares por clasificacion de audiencia")
-st.markdown(
-    "Se muestra la concentracion de generos segun la clasificacion de audiencia "
-    "(`rating`). El grafico permite identificar que tipo de contenido predomina "
-    "en cada categoria de clasificacion."
-)
+with tab3:
+    if tab3.open:
+        st.markdown("## 3. Directores con mas titulos por año de lanzamiento")
+        st.markdown(
+            "Se identifican los directores con mayor produccion en el periodo "
+            "seleccionado. El grafico muestra la evolucion anual de sus lanzamientos "
+            "en el catalogo de Netflix."
+        )
 
-df_exp_gen = df_filtrado.copy()
-df_exp_gen["genre_list"] = df_exp_gen["listed_in"].str.split(",")
-df_exp_gen = df_exp_gen.explode("genre_list")
-df_exp_gen["genre_list"] = df_exp_gen["genre_list"].str.strip()
+        datos_dir = perf.medir("directores", pendientes["directores"].result)
+        dir_anio = datos_dir["por_año"]
 
-generos_freq = (
-    df_exp_gen["genre_list"].value_counts().head(top_n_generos).index.tolist()
-)
-ratings_disponibles = sorted(df_filtrado["rating"].dropna().unique().tolist())
-ratings_sel = st.multiselect(
-    "Clasificaciones a incluir",
-    options=ratings_disponibles,
-    default=ratings_disponibles[:8],
-    key="ratings_sel",
-)
+        grafico("fig3", figuras.directores_año, dir_anio, top_n_autores)
 
-df_gen_rating = df_exp_gen[
-    df_exp_gen["genre_list"].isin(generos_freq)
-    & df_exp_gen["rating"].isin(ratings_sel)
-]
-gen_rat = (
-    df_gen_rating.groupby(["rating", "genre_list"])
-    .size()
-    .reset_index(name="cantidad")
-)
+        # Tabla resumen debajo
+        with st.expander("Ver tabla de directores con mas titulos"):
+            st.dataframe(datos_dir["tabla"], use_container_width=True, hide_index=True)
 
-fig2 = px.bar(
-    gen_rat,
-    x="rating",
-    y="cantidad",
-    color="genre_list",
-    barmode="stack",
-    labels={"rating": "Clasificacion", "cantidad": "Cantidad", "genre_list": "Genero"},
-    title="Generos por clasificacion de audiencia",
-    color_discrete_sequence=PALETTE,
-)
-fig2.update_layout(
-    plot_bgcolor="#ffffff",
-    paper_bgcolor="#ffffff",
-    font=dict(family="Segoe UI", size=12, color="#333"),
-    legend=dict(title="Genero", orientation="h", y=-0.35),
-    margin=dict(l=20, r=20, t=50, b=20),
-    height=460,
-    xaxis_title="Clasificacion de audiencia",
-    yaxis_title="Cantidad de titulos",
-)
-st.plotly_chart(fig2, use_container_width=True)
+# ══════════════════════════════════════════════════════════════════════════════
+# SECCION 3b – Directores por clasificacion de audiencia
+# ══════════════════════════════════════════════════════════════════════════════
+with tab3b:
+    if tab3b.open:
+        st.markdown("## 3b. Relacion entre director y clasificacion de audiencia")
+        st.markdown(
+            "Para los directores con mayor numero de titulos en el catalogo, se "
+            "muestra la distribucion de clasificaciones de audiencia (`rating`) "
+            "asignadas a sus producciones. Permite identificar si un director tiene "
+            "preferencia o especializacion en determinado segmento de publico."
+        )
 
-st.markdown("---")
+        # Mismo calculo que la seccion 3 (compartido por la cache de secciones)
+        datos_dir = perf.medir("directores", pendientes["directores"].result)
+        top_directores = datos_dir["top_directores"]
+        dir_rat_count = datos_dir["por_rating"]
+        orden_dir = datos_dir["orden"]
+        pivot_dr = datos_dir["matriz"]
+
+        col_3b_a, col_3b_b = st.columns([3, 2])
+
+        with col_3b_a:
+            grafico(
+                "fig3b",
+                figuras.directores_rating,
+                dir_rat_count,
+                orden_dir,
+                top_n_autores,
+                len(top_directores),
+            )
+
+        with col_3b_b:
+            # Mapa de calor director × rating
+            grafico(
+                "fig3b_heat", figuras.matriz_directores, pivot_dr, len(top_directores)
+            )
 
 # ══════════════════════════════════════════════════════════════════════════════
-# SECCION 3 – Directores por año de lanzamiento
+# SECCION 4 – Duracion por pais
 # ══════════════════════════════════════════════════════════════════════════════
-st.markdown("## 3. Directores con mas titulos por año de lanzamiento")
-st.markdown(
-    "Se identifican los directores con mayor produccion en el periodo "
-    "seleccionado. El grafico muestra la evolucion anual de sus lanzamientos "
-    "en el catalogo de Netflix."
-)
+with tab4:
+    if tab4.open:
+        st.markdown("## 4. Duracion promedio de peliculas por pais")
+        st.markdown(
+            "Se calcula la duracion promedio (en minutos) de las peliculas producidas "
+            "en cada pais. Se toman unicamente los titulos de tipo Movie con duracion "
+            "numerica disponible."
+        )
 
-df_dir = df_filtrado[df_filtrado["director"] != "Desconocido"].copy()
-top_directores = (
-    df_dir["director"].value_counts().head(top_n_autores).index.tolist()
-)
-df_dir_top = df_dir[df_dir["director"].isin(top_directores)]
-dir_anio = (
-    df_dir_top.groupby(["release_year", "director"])
-    .size()
-    .reset_index(name="titulos")
-)
+        dur_pais = perf.medir(
+            "duracion_por_pais", pendientes["duracion_por_pais"].result
+        )
 
-fig3 = px.line(
-    dir_anio,
-    x="release_year",
-    y="titulos",
-    color="director",
-    markers=True,
-    labels={
-        "release_year": "Año de lanzamiento",
-        "titulos": "Numero de titulos",
-        "director": "Director",
-    },
-    title=f"Titulos por año de lanzamiento – Top {top_n_autores} directores",
-    color_discrete_sequence=PALETTE,
-)
-fig3.update_layout(
-    plot_bgcolor="#ffffff",
-    paper_bgcolor="#ffffff",
-    font=dict(family="Segoe UI", size=12, color="#333"),
-    legend=dict(title="Director", orientation="h", y=-0.4),
-    margin=dict(l=20, r=20, t=50, b=20),
-    height=460,
-    xaxis_title="Año de lanzamiento",
-    yaxis_title="Numero de titulos",
-)
-st.plotly_chart(fig3, use_container_width=True)
-
-# Tabla resumen debajo
-with st.expander("Ver tabla de directores con mas titulos"):
-    tabla_dir = (
-        df_dir["director"]
-        .value_counts()
-        .reset_index()
-        .rename(columns={"director": "Director", "count": "Titulos"})
-        .head(top_n_autores)
-    )
-    st.dataframe(tabla_dir, use_container_width=True, hide_index=True)
+        metrica_dur = st.radio(
+            "Metrica a visualizar",
+            ["promedio", "mediana"],
+            horizontal=True,
+            key="metrica_dur",
+        )
 
-st.markdown("---")
+        grafico("fig4", figuras.duracion_pais, dur_pais, metrica_dur)
 
 # ══════════════════════════════════════════════════════════════════════════════
-# SECCION 3b – Directores por clasificacion de audiencia
+# SECCION 5 – Tiempo entre lanzamiento e incorporacion a Netflix
 # ══════════════════════════════════════════════════════════════════════════════
-st.markdown("## 3b. Relacion entre director y clasificacion de audiencia")
-st.markdown(
-    "Para los directores con mayor numero de titulos en el catalogo, se muestra "
-    "la distribucion de clasificaciones de audiencia (`rating`) asignadas a sus "
-    "producciones. Permite identificar si un director tiene preferencia o "
-    "especializacion en determinado segmento de publico."
-)
+with tab5:
+    if tab5.open:
+        st.markdown(
+            "## 5. Tiempo transcurrido entre lanzamiento e incorporacion a Netflix"
+        )
+        st.markdown(
+            "Se calcula la diferencia entre el año en que el titulo fue lanzado "
+            "(`release_year`) y el año en que fue incorporado al catalogo de Netflix "
+            "(`date_added`). Un valor positivo indica que el contenido fue agregado "
+            "despues de su estreno; un valor negativo podria indicar pre-estrenos."
+        )
 
-# Reutilizamos df_dir y top_directores ya calculados arriba
-df_dir_rating = df_dir[df_dir["director"].isin(top_directores)].copy()
+        datos_tiempo = perf.medir(
+            "tiempo_incorporacion", pendientes["tiempo_incorporacion"].result
+        )
 
-col_3b_a, col_3b_b = st.columns([3, 2])
+        col_a, col_b = st.columns(2)
 
-with col_3b_a:
-    dir_rat_count = (
-        df_dir_rating.groupby(["director", "rating"])
-        .size()
-        .reset_index(name="titulos")
-    )
-    # Ordenar directores por total de titulos (mayor arriba)
-    orden_dir = (
-        dir_rat_count.groupby("director")["titulos"]
-        .sum()
-        .sort_values(ascending=False)
-        .index.tolist()
-    )
+        with col_a:
+            grafico("fig5a", figuras.histograma_tiempo, datos_tiempo["histograma"])
 
-    fig3b = px.bar(
-        dir_rat_count,
-        x="titulos",
-        y="director",
-        color="rating",
-        orientation="h",
-        barmode="stack",
-        category_orders={"director": orden_dir},
-        labels={
-            "titulos": "Numero de titulos",
-            "director": "Director",
-            "rating": "Clasificacion",
-        },
-        title=f"Clasificaciones por director – Top {top_n_autores}",
-        color_discrete_sequence=PALETTE,
-    )
-    fig3b.update_layout(
-        plot_bgcolor="#ffffff",
-        paper_bgcolor="#ffffff",
-        font=dict(family="Segoe UI", size=12, color="#333"),
-        legend=dict(title="Clasificacion", orientation="h", y=-0.3),
-        margin=dict(l=20, r=20, t=50, b=20),
-        height=max(380, len(top_directores) * 36),
-        xaxis_title="Numero de titulos",
-        yaxis_title="Director",
-    )
-    st.plotly_chart(fig3b, use_container_width=True)
-
-with col_3b_b:
-    # Mapa de calor director × rating
-    pivot_dr = (
-        df_dir_rating.groupby(["director", "rating"])
-        .size()
-        .unstack(fill_value=0)
-    )
-    # Mantener solo ratings con al menos un título
-    pivot_dr = pivot_dr.loc[:, pivot_dr.sum() > 0]
-    pivot_dr = pivot_dr.loc[orden_dir]  # Mismo orden que el bar
-
-    fig3b_heat = go.Figure(
-        data=go.Heatmap(
-            z=pivot_dr.values,
-            x=pivot_dr.columns.tolist(),
-            y=pivot_dr.index.tolist(),
-            colorscale=[
-                [0, "#f7f8fa"],
-                [0.4, "#f5a9a0"],
-                [1, "#c0392b"],
-            ],
-            showscale=True,
-            colorbar=dict(title="Titulos"),
-            text=pivot_dr.values,
-            texttemplate="%{text}",
-            textfont=dict(size=10),
+        with col_b:
+            resumen_tipo = datos_tiempo["resumen"]
+
+            grafico("fig5b", figuras.dispersion_tiempo, datos_tiempo["cajas"])
+
+        # Estadísticas clave debajo
+        st.markdown("#### Estadisticas de tiempo transcurrido")
+        st.dataframe(resumen_tipo, use_container_width=True, hide_index=True)
+
+        # Evolucion temporal
+        df_evol = datos_tiempo["evolucion"]
+
+        grafico("fig5c", figuras.evolucion_tiempo, df_evol)
+
+# ══════════════════════════════════════════════════════════════════════════════
+# SECCION 6 – Red de colaboraciones
+# ══════════════════════════════════════════════════════════════════════════════
+with tab6:
+    if tab6.open:
+        st.markdown("## 6. Red de colaboraciones entre directores y reparto")
+        st.markdown(
+            "Se separan las columnas `director` y `cast` en personas y se unen dos "
+            "personas cada vez que comparten un titulo. La red permite identificar a "
+            "quienes mas colaboran y que tan conectado esta el catalogo filtrado."
         )
-    )
-    fig3b_heat.update_layout(
-        title="Matriz director × clasificacion",
-        plot_bgcolor="#ffffff",
-        paper_bgcolor="#ffffff",
-        font=dict(family="Segoe UI", size=11, color="#333"),
-        margin=dict(l=20, r=20, t=50, b=20),
-        height=max(380, len(top_directores) * 36),
-        xaxis_title="Clasificacion",
-        yaxis_title="Director",
-        xaxis=dict(tickangle=-30),
-    )
-    st.plotly_chart(fig3b_heat, use_container_width=True)
 
-st.markdown("---")
+        red = perf.medir("red_colaboraciones", pendientes["red_colaboraciones"].result)
+        resumen_red = red["resumen"]
+
+        col6a, col6b, col6c, col6d = st.columns(4)
+        col6a.metric("Personas con colaboraciones", f"{resumen_red['personas']:,}")
+        col6b.metric("Colaboraciones", f"{resumen_red['colaboraciones']:,}")
+        col6c.metric("Componentes conexas", f"{resumen_red['componentes']:,}")
+        col6d.metric("Mayor componente", f"{resumen_red['mayor_componente']:.1%}")
+
+        col_6a, col_6b = st.columns([3, 2])
+
+        with col_6a:
+            grafico("fig6", figuras.ranking_colaboraciones, red["ranking"])
+
+        with col_6b:
+            persona = st.selectbox(
+                "Colaboradores frecuentes de",
+                options=red["ranking"]["Persona"].tolist(),
+                key="persona_red",
+            )
+            if persona:
+                st.dataframe(
+                    perf.medir(
+                        "colaboradores_de",
+                        secciones.colaboradores_de,
+                        grafo_personas,
+                        red["adyacencia"],
+                        persona,
+                    ),
+                    use_container_width=True,
+                    hide_index=True,
+                )
 
 # ══════════════════════════════════════════════════════════════════════════════
-# SECCION 4 – Duracion por pais
+# SECCION 7 – Tendencias de incorporacion
 # ══════════════════════════════════════════════════════════════════════════════
-st.markdown("## 4. Duracion promedio de peliculas por pais")
-st.markdown(
-    "Se calcula la duracion promedio (en minutos) de las peliculas producidas "
-    "en cada pais. Se toman unicamente los titulos de tipo Movie con duracion "
-    "numerica disponible."
-)
+with tab7:
+    if tab7.open:
+        st.markdown("## 7. Tendencias de incorporacion al catalogo")
+        st.markdown(
+            "Se agrupa `date_added` por mes o por semana y se cuenta cuantos titulos "
+            "se incorporaron en cada periodo. Las ventanas moviles suavizan la serie "
+            "y el impulso compara la ultima ventana del rango con la anterior para "
+            "detectar los generos y paises que crecen mas rapido."
+        )
 
-df_movies = df_filtrado[df_filtrado["type"] == "Movie"].copy()
-df_movies = df_movies.dropna(subset=["duracion_min"])
-df_movies_pais = df_movies.copy()
-df_movies_pais["country_list"] = df_movies_pais["country"].str.split(",")
-df_movies_pais = df_movies_pais.explode("country_list")
-df_movies_pais["country_list"] = df_movies_pais["country_list"].str.strip()
-
-if paises_selec:
-    df_mp_filt = df_movies_pais[df_movies_pais["country_list"].isin(paises_selec)]
-else:
-    top20_paises = (
-        df_movies_pais["country_list"].value_counts().head(20).index.tolist()
-    )
-    df_mp_filt = df_movies_pais[df_movies_pais["country_list"].isin(top20_paises)]
-
-dur_pais = (
-    df_mp_filt.groupby("country_list")["duracion_min"]
-    .agg(promedio="mean", mediana="median", cantidad="count")
-    .reset_index()
-    .rename(columns={"country_list": "Pais"})
-    .sort_values("promedio", ascending=True)
-)
+        tendencias = perf.medir("tendencias", cargar_tendencias, version)
+
+        with st.form("filtro_tendencias", border=False):
+            col7a, col7b, col7c = st.columns([1, 2, 3])
+            with col7a:
+                granularidad = st.radio(
+                    "Granularidad", ["mes", "semana"], format_func=str.capitalize
+                )
+            singular, plural, maximo = {
+                "mes": ("mes", "meses", 24),
+                "semana": ("semana", "semanas", 104),
+            }[granularidad]
+            with col7b:
+                ventana = st.slider(f"Ventana movil ({plural})", 1, maximo, 12)
+            with col7c:
+                periodos = tendencias[granularidad]["total"].fechas.astype(object)
+                desde, hasta = st.slider(
+                    "Fecha de incorporacion",
+                    min_value=periodos[0],
+                    max_value=periodos[-1],
+                    value=(periodos[0], periodos[-1]),
+                    format="MMM YYYY",
+                )
+            st.form_submit_button(
+                "Aplicar", on_click=contar_aplicacion, args=("filtro_tendencias",)
+            )
+        etiqueta_ventana = f"{ventana} {singular if ventana == 1 else plural}"
+        rango_fechas = (desde, hasta, granularidad, ventana)
+
+        crecimiento = perf.medir(
+            "crecimiento_catalogo",
+            secciones.crecimiento_catalogo,
+            tendencias,
+            filtro[0],
+            *rango_fechas,
+        )
+        grafico("fig7a", figuras.crecimiento_catalogo, crecimiento, etiqueta_ventana)
+
+        etiqueta = st.radio("Impulso por", ["Genero", "Pais"], horizontal=True)
+        dimension = {"Genero": "genero", "Pais": "pais"}[etiqueta]
+        datos_impulso = perf.medir(
+            "impulso",
+            secciones.impulso,
+            tendencias,
+            dimension,
+            filtro[0],
+            *rango_fechas,
+            top_n_generos,
+        )
 
-metrica_dur = st.radio(
-    "Metrica a visualizar",
-    ["promedio", "mediana"],
-    horizontal=True,
-    key="metrica_dur",
-)
+        col_7a, col_7b = st.columns([3, 2])
 
-fig4 = px.bar(
-    dur_pais,
-    x=metrica_dur,
-    y="Pais",
-    orientation="h",
-    text=dur_pais[metrica_dur].round(1),
-    labels={metrica_dur: "Duracion (minutos)", "Pais": "Pais"},
-    title=f"Duracion {metrica_dur} de peliculas por pais (minutos)",
-    color=metrica_dur,
-    color_continuous_scale=["#f5a9a0", "#c0392b"],
-)
-fig4.update_traces(textposition="outside")
-fig4.update_layout(
-    plot_bgcolor="#ffffff",
-    paper_bgcolor="#ffffff",
-    font=dict(family="Segoe UI", size=12, color="#333"),
-    coloraxis_showscale=False,
-    margin=dict(l=20, r=40, t=50, b=20),
-    height=max(380, len(dur_pais) * 32),
-    xaxis_title="Duracion (minutos)",
-    yaxis_title="Pais",
-)
-st.plotly_chart(fig4, use_container_width=True)
+        with col_7a:
+            grafico(
+                "fig7b",
+                figuras.series_impulso,
+                datos_impulso["series"],
+                etiqueta,
+                etiqueta_ventana,
+            )
 
-st.markdown("---")
+        with col_7b:
+            grafico("fig7c", figuras.barras_impulso, datos_impulso["impulso"], etiqueta)
+
+        st.dataframe(
+            datos_impulso["impulso"].rename(columns={"Valor": etiqueta}),
+            use_container_width=True,
+            hide_index=True,
+        )
 
 # ══════════════════════════════════════════════════════════════════════════════
-# SECCION 5 – Tiempo entre lanzamiento e incorporacion a Netflix
+# SECCION 8 – Comparacion de catalogos
 # ══════════════════════════════════════════════════════════════════════════════
-st.markdown("## 5. Tiempo transcurrido entre lanzamiento e incorporacion a Netflix")
-st.markdown(
-    "Se calcula la diferencia entre el año en que el titulo fue lanzado "
-    "(`release_year`) y el año en que fue incorporado al catalogo de Netflix "
-    "(`date_added`). Un valor positivo indica que el contenido fue agregado "
-    "despues de su estreno; un valor negativo podria indicar pre-estrenos."
-)
+with tab8:
+    if tab8.open:
+        st.markdown("## 8. Comparacion de catalogos")
+        st.markdown(
+            "Se comparan las secciones 1 a 5 entre varias instantaneas del catalogo "
+            "(por region o por mes). Cada archivo se limpia igual que el catalogo "
+            "principal y sus agregados se alinean sobre las mismas categorias, para "
+            "verlos lado a lado o como diferencia frente a un catalogo de referencia."
+        )
 
-df_tiempo = df_filtrado.dropna(subset=["años_diferencia"]).copy()
-df_tiempo = df_tiempo[df_tiempo["años_diferencia"].between(-2, 30)]
-
-col_a, col_b = st.columns(2)
-
-with col_a:
-    fig5a = px.histogram(
-        df_tiempo,
-        x="años_diferencia",
-        color="type",
-        nbins=32,
-        barmode="overlay",
-        opacity=0.8,
-        labels={"años_diferencia": "Años de diferencia", "type": "Tipo"},
-        title="Distribucion de tiempo entre lanzamiento e incorporacion",
-        color_discrete_map={"Movie": "#c0392b", "TV Show": "#2c3e50"},
-    )
-    fig5a.update_layout(
-        plot_bgcolor="#ffffff",
-        paper_bgcolor="#ffffff",
-        font=dict(family="Segoe UI", size=12, color="#333"),
-        legend=dict(title="Tipo", orientation="h", y=-0.25),
-        margin=dict(l=20, r=20, t=50, b=20),
-        height=400,
-        xaxis_title="Años transcurridos",
-        yaxis_title="Numero de titulos",
-    )
-    st.plotly_chart(fig5a, use_container_width=True)
-
-with col_b:
-    resumen_tipo = (
-        df_tiempo.groupby("type")["años_diferencia"]
-        .agg(["mean", "median", "std"])
-        .reset_index()
-        .rename(
-            columns={
-                "type": "Tipo",
-                "mean": "Promedio",
-                "median": "Mediana",
-                "std": "Desv. Estandar",
-            }
+    if tab8.open and len(CATALOGOS) < 2:
+        st.info(
+            "Defina la variable de entorno `NETFLIX_CATALOGOS` con dos o mas "
+            "archivos CSV (separados por `:`) o con un directorio que los contenga."
         )
-    )
-    resumen_tipo[["Promedio", "Mediana", "Desv. Estandar"]] = resumen_tipo[
-        ["Promedio", "Mediana", "Desv. Estandar"]
-    ].round(2)
-
-    fig5b = go.Figure()
-    for t, color in zip(
-        df_tiempo["type"].unique(), ["#c0392b", "#2c3e50"]
-    ):
-        subset = df_tiempo[df_tiempo["type"] == t]["años_diferencia"]
-        fig5b.add_trace(
-            go.Box(
-                y=subset,
-                name=t,
-                marker_color=color,
-                boxmean="sd",
-                line=dict(width=1.5),
+    elif tab8.open:
+        apilado = perf.medir(
+            "comparacion",
+            cargar_comparacion,
+            tuple(datos.version_archivo(r) for r in CATALOGOS),
+        )
+        nombres = comparacion.etiquetas(CATALOGOS)
+
+        col8a, col8b = st.columns([1, 2])
+        with col8a:
+            vista = st.radio("Vista", ["Lado a lado", "Diferencia"], horizontal=True)
+        with col8b:
+            referencia = st.selectbox(
+                "Catalogo de referencia", nombres, disabled=vista != "Diferencia"
+            )
+        en_diferencia = vista == "Diferencia"
+
+        def comparar(nombre, funcion, *args):
+            return perf.medir(nombre, funcion, apilado, *filtro, *args)
+
+        def vista_de(tabla, valor, valores):
+            if not en_diferencia:
+                return tabla
+            return comparacion.diferencia(tabla, valor, referencia, valores)
+
+        sufijo = f" (diferencia frente a {referencia})" if en_diferencia else ""
+
+        if paises_selec:
+            grafico(
+                "fig8a",
+                figuras.comparacion_matriz,
+                vista_de(
+                    comparar(
+                        "comparar_generos_por_pais",
+                        secciones.comparar_generos_por_pais,
+                        tuple(paises_selec),
+                        top_n_generos,
+                    ),
+                    "cantidad",
+                    ["cantidad"],
+                ),
+                "genre_list",
+                "country_list",
+                "cantidad",
+                {"genre_list": "Genero", "country_list": "Pais", "cantidad": "Titulos"},
+                "Generos por pais" + sufijo,
+                en_diferencia,
             )
+
+        grafico(
+            "fig8b",
+            figuras.comparacion_matriz,
+            vista_de(
+                comparar(
+                    "comparar_generos_por_rating",
+                    secciones.comparar_generos_por_rating,
+                    top_n_generos,
+                ),
+                "cantidad",
+                ["cantidad"],
+            ),
+            "genre_list",
+            "rating",
+            "cantidad",
+            {"genre_list": "Genero", "rating": "Clasificacion", "cantidad": "Titulos"},
+            "Generos por clasificacion" + sufijo,
+            en_diferencia,
         )
-    fig5b.update_layout(
-        title="Dispersion del tiempo por tipo de contenido",
-        plot_bgcolor="#ffffff",
-        paper_bgcolor="#ffffff",
-        font=dict(family="Segoe UI", size=12, color="#333"),
-        legend=dict(title="Tipo"),
-        margin=dict(l=20, r=20, t=50, b=20),
-        height=400,
-        yaxis_title="Años transcurridos",
-    )
-    st.plotly_chart(fig5b, use_container_width=True)
-
-# Estadísticas clave debajo
-st.markdown("#### Estadisticas de tiempo transcurrido")
-st.dataframe(resumen_tipo, use_container_width=True, hide_index=True)
-
-# Evolucion temporal
-df_evol = (
-    df_tiempo.groupby(["year_added", "type"])["años_diferencia"]
-    .mean()
-    .reset_index()
-    .dropna()
-)
-df_evol["year_added"] = df_evol["year_added"].astype(int)
-
-fig5c = px.line(
-    df_evol,
-    x="year_added",
-    y="años_diferencia",
-    color="type",
-    markers=True,
-    labels={
-        "year_added": "Año de incorporacion a Netflix",
-        "años_diferencia": "Diferencia promedio (años)",
-        "type": "Tipo",
-    },
-    title="Evolucion de la diferencia promedio por año de incorporacion",
-    color_discrete_map={"Movie": "#c0392b", "TV Show": "#2c3e50"},
-)
-fig5c.update_layout(
-    plot_bgcolor="#ffffff",
-    paper_bgcolor="#ffffff",
-    font=dict(family="Segoe UI", size=12, color="#333"),
-    legend=dict(title="Tipo", orientation="h", y=-0.25),
-    margin=dict(l=20, r=20, t=50, b=20),
-    height=380,
-    xaxis_title="Año de incorporacion",
-    yaxis_title="Diferencia promedio (años)",
-)
-st.plotly_chart(fig5c, use_container_width=True)
 
-st.markdown("---")
+        col_8a, col_8b = st.columns(2)
+
+        with col_8a:
+            grafico(
+                "fig8c",
+                figuras.comparacion_barras,
+                vista_de(
+                    comparar(
+                        "comparar_directores",
+                        secciones.comparar_directores,
+                        top_n_autores,
+                    ),
+                    "titulos",
+                    ["titulos"],
+                ),
+                "director",
+                "titulos",
+                {"director": "Director", "titulos": "Titulos"},
+                "Directores con mas titulos" + sufijo,
+            )
+
+        with col_8b:
+            valores_resumen = ["cantidad", "promedio", "mediana"]
+            grafico(
+                "fig8e",
+                figuras.comparacion_barras,
+                vista_de(
+                    comparar("comparar_tiempo", secciones.comparar_tiempo),
+                    "promedio",
+                    valores_resumen,
+                ),
+                "type",
+                "promedio",
+                {"type": "Tipo", "promedio": "Diferencia promedio (años)"},
+                "Años entre lanzamiento e incorporacion" + sufijo,
+            )
+
+        if paises_selec:
+            grafico(
+                "fig8d",
+                figuras.comparacion_barras,
+                vista_de(
+                    comparar(
+                        "comparar_duracion",
+                        secciones.comparar_duracion,
+                        tuple(paises_selec),
+                    ),
+                    "promedio",
+                    valores_resumen,
+                ),
+                "country_list",
+                "promedio",
+                {"country_list": "Pais", "promedio": "Duracion promedio (min)"},
+                "Duracion promedio de peliculas por pais" + sufijo,
+            )
 
 # ── Pie de pagina ─────────────────────────────────────────────────────────────
 st.markdown(
@@ -653,3 +844,54 @@ st.markdown(
     "</div>",
     unsafe_allow_html=True,
 )
+
+# ── Calidad de datos (barra lateral) ──────────────────────────────────────────
+with st.sidebar:
+    with st.expander("Calidad de datos"):
+        cuarentena = cargar_cuarentena(version)
+        st.caption(
+            f"{len(cuarentena):,} filas en cuarentena de "
+            f"{len(cuarentena) + len(df):,} en el CSV"
+        )
+        st.dataframe(
+            datos.resumen_validacion(cuarentena, len(df)),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.dataframe(
+            cuarentena[["show_id", "title", "rating", "duration", "motivos"]],
+            use_container_width=True,
+            hide_index=True,
+        )
+
+# ── Estado de la cache (barra lateral) ────────────────────────────────────────
+with st.sidebar:
+    with st.expander("Cache de secciones"):
+        st.dataframe(
+            pd.DataFrame.from_dict(memo.estadisticas(), orient="index"),
+            use_container_width=True,
+        )
+    with st.expander("Cache de graficos"):
+        st.dataframe(
+            pd.DataFrame.from_dict(figuras.estadisticas(), orient="index").round(1),
+            use_container_width=True,
+        )
+
+# ── Perfil del rerun (barra lateral) ──────────────────────────────────────────
+total_ms = perf.cerrar(
+    tipos=filtro[0],
+    años=filtro[1:],
+    paises=len(paises_selec),
+    seccion=st.session_state.get("seccion"),
+    motivo=motivo,
+    reruns_sesion=sum(reruns.values()),
+)
+if perf.activo:
+    with st.sidebar:
+        with st.expander("Perfil del rerun", expanded=True):
+            st.caption(f"Total: {total_ms:,.0f} ms · registro: {perf.registro}")
+            st.caption(
+                "Reruns de la sesion: "
+                + " · ".join(f"{m}: {n}" for m, n in reruns.most_common())
+            )
+            st.dataframe(perf.tabla(), use_container_width=True, hide_index=True)
@@ -0,0 +1,761 @@
+"""Carga y preparacion del catalogo de Netflix, independiente de Streamlit."""
+import hashlib
+import io
+import json
+import os
+import shutil
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from cubo import CUBOIDES, combinar_cubos, construir_cubo
+
+RUTA_CATALOGO = "netflix_titles.csv"
+DIRECTORIO_CACHE = Path(".cache_datos")
+
+# Se incrementa cuando cambia la limpieza (o el formato de los archivos),
+# para invalidar la cache en disco
+VERSION_CACHE = 6
+
+# Columnas de baja cardinalidad que se guardan como `category`. `director`
+# queda como texto: es casi unico por titulo y la categoria no ahorra memoria
+COLUMNAS_CATEGORICAS = ["type", "rating", "country", "listed_in"]
+
+# Texto libre largo que no usa ningun grafico; se guarda aparte
+COLUMNAS_TEXTO = ["cast", "description"]
+
+# Valores que la limpieza imputa: a `director` y `cast` sin dato, y a
+# `country` sin dato
+SIN_PERSONA = "Desconocido"
+SIN_PAIS = "Otros"
+
+# Tipos de lectura fijos: cada bloque del CSV produce las mismas columnas
+# aunque alguna venga vacia en ese bloque
+TIPOS_CSV = {
+    col: "str"
+    for col in [
+        "show_id", "type", "title", "director", "cast", "country",
+        "date_added", "rating", "duration", "listed_in", "description",
+    ]
+}
+
+# Cubos parciales que se acumulan antes de sumarlos durante la ingesta
+CUBOS_POR_COMBINACION = 16
+
+# Archivos del catalogo en la cache (los del cubo se agregan aparte)
+ARCHIVOS_CATALOGO = ("catalogo", "pais", "genero", "texto", "cuarentena")
+
+# Clasificaciones validas de `rating` (MPAA y TV Parental Guidelines)
+RATINGS = frozenset(
+    {
+        "G", "PG", "PG-13", "R", "NC-17", "NR", "UR",
+        "TV-Y", "TV-Y7", "TV-Y7-FV", "TV-G", "TV-PG", "TV-14", "TV-MA",
+    }
+)
+TIPOS_TITULO = frozenset({"Movie", "TV Show"})
+
+# Primer año de lanzamiento admitido
+AÑO_MINIMO = 1900
+
+# Una serie puede incorporarse un año antes del lanzamiento registrado (toma
+# el de su ultima temporada); una diferencia menor es un error de la fuente
+MIN_DIFERENCIA = -1
+
+# Motivos de rechazo de una fila, en el orden de sus bits
+MOTIVOS = (
+    "show_id_duplicado",
+    "tipo_invalido",
+    "sin_fecha",
+    "fecha_invalida",
+    "sin_rating",
+    "rating_invalido",
+    "sin_duracion",
+    "duracion_invalida",
+    "duracion_no_corresponde",
+    "año_invalido",
+    "diferencia_negativa",
+)
+
+
+# ── Parseo de fechas y duraciones ─────────────────────────────────────────────
+def por_valor(serie, parsear):
+    """Aplica `parsear` una vez por valor distinto y lo extiende a las filas.
+
+    Fechas y duraciones se repiten mucho (unos cientos de duraciones y menos
+    de dos mil fechas), asi que se parsean solo los valores unicos.
+    """
+    codigos, unicos = pd.factorize(serie)
+    resultado = parsear(pd.Series(unicos, dtype="str"))
+    # Los faltantes (codigo -1) quedan como NA
+    return resultado.reindex(codigos).set_axis(serie.index)
+
+
+def parsear_fechas(fechas):
+    """Fechas como "September 25, 2021" (con espacios sobrantes)."""
+    return pd.to_datetime(fechas.str.strip(), format="%B %d, %Y", errors="coerce")
+
+
+def parsear_duraciones(duraciones):
+    """Minutos ("90 min") y temporadas ("2 Seasons") en una sola pasada."""
+    partes = duraciones.str.extract(r"^\s*(\d+)\s*(min|Season)", expand=True)
+    cantidad = partes[0].astype("Int64")
+    return pd.DataFrame(
+        {
+            "duracion_min": cantidad.where(partes[1] == "min"),
+            "temporadas": cantidad.where(partes[1] == "Season"),
+        }
+    )
+
+
+# ── Validacion ────────────────────────────────────────────────────────────────
+def validar(df, repetidos=None):
+    """Motivos de rechazo de cada fila, como bits de `MOTIVOS` (0 = valida).
+
+    Cada regla es una operacion vectorizada sobre una columna, y fechas y
+    duraciones se parsean una vez por valor distinto. Devuelve tambien las
+    columnas parseadas (fecha, duraciones y año), para no repetirlo al
+    limpiar.
+    `repetidos` marca las filas cuyo `show_id` reaparece mas adelante (por
+    defecto, dentro de `df`): vale la ultima version.
+    """
+    fechas = por_valor(df["date_added"], parsear_fechas)
+    duracion = por_valor(df["duration"], parsear_duraciones)
+    lanzamiento = pd.to_numeric(df["release_year"], errors="coerce")
+    hoy = pd.Timestamp.now()
+    if repetidos is None:
+        repetidos = df["show_id"].duplicated(keep="last")
+    sin_unidad = duracion["duracion_min"].isna() & duracion["temporadas"].isna()
+
+    reglas = {
+        "show_id_duplicado": repetidos,
+        "tipo_invalido": ~df["type"].isin(TIPOS_TITULO),
+        "sin_fecha": df["date_added"].isna(),
+        "fecha_invalida": df["date_added"].notna() & ~(fechas <= hoy),
+        "sin_rating": df["rating"].isna(),
+        "rating_invalido": df["rating"].notna() & ~df["rating"].isin(RATINGS),
+        "sin_duracion": df["duration"].isna(),
+        "duracion_invalida": df["duration"].notna() & sin_unidad,
+        "duracion_no_corresponde": (
+            ((df["type"] == "Movie") & duracion["temporadas"].notna())
+            | ((df["type"] == "TV Show") & duracion["duracion_min"].notna())
+        ),
+        "año_invalido": ~lanzamiento.between(AÑO_MINIMO, hoy.year),
+        "diferencia_negativa": (fechas.dt.year - lanzamiento) < MIN_DIFERENCIA,
+    }
+    motivos = np.zeros(len(df), dtype=np.uint16)
+    for bit, motivo in enumerate(MOTIVOS):
+        regla = np.asarray(pd.Series(reglas[motivo]).fillna(False), dtype=bool)
+        motivos |= regla.astype(np.uint16) << bit
+    parseadas = duracion.assign(fecha=fechas, release_year=lanzamiento)
+    return motivos, parseadas
+
+
+def describir_motivos(motivos):
+    """Nombres de los motivos de cada fila ("sin_fecha, rating_invalido")."""
+    codigos, filas = np.unique(motivos, return_inverse=True)
+    nombres = [
+        ", ".join(m for bit, m in enumerate(MOTIVOS) if codigo >> bit & 1)
+        for codigo in codigos
+    ]
+    return pd.Categorical.from_codes(filas.ravel(), nombres)
+
+
+def resumen_validacion(cuarentena, n_validas):
+    """Filas rechazadas por motivo (una fila puede tener varios)."""
+    por_motivo = (
+        cuarentena["motivos"].astype(str).str.split(", ").explode().value_counts()
+    )
+    resumen = (
+        por_motivo.reindex(list(MOTIVOS), fill_value=0)
+        .rename_axis("motivo")
+        .rename("filas")
+        .reset_index()
+    )
+    resumen["% del total"] = (
+        resumen["filas"] / max(n_validas + len(cuarentena), 1) * 100
+    ).round(2)
+    return resumen[resumen["filas"] > 0].reset_index(drop=True)
+
+
+# ── Limpieza ──────────────────────────────────────────────────────────────────
+def _rechazadas(df, motivos):
+    """Filas con algun motivo de rechazo, tal como vinieron, con sus motivos."""
+    invalidas = motivos != 0
+    return (
+        df[invalidas]
+        .assign(motivos=describir_motivos(motivos[invalidas]))
+        .reset_index(drop=True)
+    )
+
+
+def limpiar_catalogo(df, cuarentena=None, repetidos=None):
+    """Valida, imputa y agrega las columnas derivadas del EDA.
+
+    Las filas que no pasan `validar` se descartan; si se da la lista
+    `cuarentena`, se le agregan (tal como vinieron) con sus motivos.
+    """
+    motivos, parseadas = validar(df, repetidos)
+    validas = motivos == 0
+    if cuarentena is not None:
+        cuarentena.append(_rechazadas(df, motivos))
+    df = df[validas].copy()
+    parseadas = parseadas[validas]
+
+    # Imputación (reproduciendo el EDA)
+    df["director"] = df["director"].fillna(SIN_PERSONA)
+    df["cast"] = df["cast"].fillna(SIN_PERSONA)
+    df["country"] = df["country"].fillna(SIN_PAIS)
+
+    # Columna año de incorporación a Netflix
+    df["year_added"] = parseadas["fecha"].dt.year.astype("Int64")
+
+    # Diferencia de años
+    df["release_year"] = parseadas["release_year"].astype(np.int64)
+    df["años_diferencia"] = df["year_added"] - df["release_year"]
+
+    # Duración numérica: minutos para películas, temporadas para series
+    df["duracion_min"] = parseadas["duracion_min"]
+    df["temporadas"] = parseadas["temporadas"]
+
+    # Posición de fila = índice, para que las tablas puente apunten a filas
+    df.reset_index(drop=True, inplace=True)
+    return df
+
+
+def compactar(df):
+    """Pasa a `category` las columnas repetitivas y reduce los enteros."""
+    for col in COLUMNAS_CATEGORICAS:
+        df[col] = df[col].astype("category")
+    df["release_year"] = pd.to_numeric(df["release_year"], downcast="integer")
+    df["year_added"] = df["year_added"].astype("Int16")
+    df["años_diferencia"] = df["años_diferencia"].astype("Int16")
+    df["duracion_min"] = df["duracion_min"].astype("Int16")
+    df["temporadas"] = df["temporadas"].astype("Int16")
+    return df
+
+
+# ── Tablas puente ─────────────────────────────────────────────────────────────
+def construir_puente(serie, columna):
+    """Expande una columna multivalor en una tabla (fila, valor) categorica.
+
+    Solo se separan las categorias distintas de la columna; cada fila toma
+    sus valores por codigo, sin volver a partir cadenas repetidas.
+    """
+    serie = serie.astype("category")
+    partes = (
+        pd.Series(serie.cat.categories)
+        .str.split(",")
+        .explode()
+        .str.strip()
+    )
+    partes = partes[partes.notna() & (partes != "")]
+    valores = pd.DataFrame(
+        {"codigo": partes.index.to_numpy(), columna: pd.Categorical(partes)}
+    )
+    filas = pd.DataFrame(
+        {
+            "fila": np.arange(len(serie), dtype=np.int32),
+            "codigo": serie.cat.codes.to_numpy(),
+        }
+    )
+    puente = filas.merge(valores, on="codigo")
+    return puente[["fila", columna]]
+
+
+# ── Cache binaria en disco ────────────────────────────────────────────────────
+def _firmas(ruta, hasta=None, bloque=1 << 20):
+    """SHA-256 del archivo y de sus primeros `hasta` bytes, en una sola lectura.
+
+    Devuelve (bytes leidos, firma del archivo, firma del prefijo); la del
+    prefijo es None si no se pide o si el archivo es mas corto.
+    """
+    h = hashlib.sha256(f"v{VERSION_CACHE}".encode())
+    leidos, prefijo = 0, None
+    with open(ruta, "rb") as f:
+        for trozo in iter(lambda: f.read(bloque), b""):
+            if hasta is not None and leidos <= hasta < leidos + len(trozo):
+                h.update(trozo[: hasta - leidos])
+                prefijo = h.hexdigest()
+                trozo = trozo[hasta - leidos :]
+            h.update(trozo)
+            leidos = f.tell()
+    if hasta == leidos:
+        prefijo = h.hexdigest()
+    return leidos, h.hexdigest(), prefijo
+
+
+# Firmas de la ultima version leida de cada archivo, por ruta absoluta:
+# {ruta: ((tamaño, fecha de modificacion), bytes leidos, firma, {hasta: prefijo})}
+_FIRMAS = {}
+
+
+def _firmas_version(ruta, hasta=None):
+    """`_firmas` de la version actual de `ruta` (ver `version_archivo`).
+
+    El archivo se lee una vez por version y proceso; solo se relee si se
+    pide el prefijo de un `hasta` que no se calculo en esa lectura.
+    """
+    clave, version = str(Path(ruta).resolve()), version_archivo(ruta)
+    guardadas = _FIRMAS.get(clave)
+    if guardadas is None or guardadas[0] != version:
+        leidos, firma, prefijo = _firmas(ruta, hasta)
+        guardadas = _FIRMAS[clave] = (version, leidos, firma, {hasta: prefijo})
+    _, leidos, firma, prefijos = guardadas
+    if hasta is None:
+        return leidos, firma, None
+    if hasta == leidos:  # el prefijo es el archivo entero
+        return leidos, firma, firma
+    if hasta not in prefijos:
+        prefijos[hasta] = _firmas(ruta, hasta)[2]
+    return leidos, firma, prefijos[hasta]
+
+
+def hash_archivo(ruta):
+    """Huella SHA-256 del archivo fuente (junto con la version de la cache).
+
+    Se calcula una vez por version del archivo: las cargas del catalogo, el
+    cubo, los textos y las estructuras compartidas la reutilizan.
+    """
+    return _firmas_version(ruta)[1][:20]
+
+
+def _rutas_cache(directorio, huella, nombres=ARCHIVOS_CATALOGO):
+    directorio = Path(directorio)
+    return {nombre: directorio / f"{huella}_{nombre}.feather" for nombre in nombres}
+
+
+def _rutas_cubo(directorio, huella):
+    rutas = _rutas_cache(directorio, huella, [f"cubo_{n}" for n in CUBOIDES])
+    return dict(zip(CUBOIDES, rutas.values()))
+
+
+def _escribir_feather(df, ruta):
+    # Escritura atomica: otros procesos nunca ven un archivo a medias. Sin
+    # compresion, para que `leer_feather` pueda mapearlo sin copiar
+    temporal = ruta.with_suffix(f".{os.getpid()}.tmp")
+    df.to_feather(temporal, compression="uncompressed")
+    os.replace(temporal, ruta)
+
+
+def leer_feather(ruta, mapear=False):
+    """Lee un Feather de la cache; con `mapear`, sin copiarlo a memoria.
+
+    Mapeado, las columnas de texto apuntan directamente a las paginas del
+    archivo, que el sistema comparte entre todos los procesos que lo leen.
+    """
+    if not mapear:
+        return pd.read_feather(ruta)
+    tabla = pa.ipc.open_file(pa.memory_map(str(ruta))).read_all()
+    return tabla.to_pandas(split_blocks=True)
+
+
+# ── Ingesta por bloques ───────────────────────────────────────────────────────
+def concatenar(partes):
+    """Une frames con columnas categoricas sin pasarlas a texto.
+
+    Las categorias de cada columna se igualan a la union (ordenada) de todos
+    los bloques antes de concatenar.
+    """
+    partes = [p for p in partes if len(p)] or partes[:1]
+    for col in partes[0].columns:
+        if isinstance(partes[0][col].dtype, pd.CategoricalDtype):
+            categorias = sorted(
+                set().union(*(p[col].cat.categories for p in partes))
+            )
+            partes = [
+                p.assign(**{col: p[col].cat.set_categories(categorias)})
+                for p in partes
+            ]
+    return pd.concat(partes, ignore_index=True)
+
+
+def ingerir_por_bloques(ruta, tamaño_bloque, ruta_texto=None):
+    """Lee el CSV en bloques de `tamaño_bloque` filas y arma el catalogo.
+
+    Cada bloque pasa por la misma limpieza y compactacion que la carga
+    completa, y de el salen sus filas de las tablas puente y su aporte al
+    cubo, que se acumula bloque a bloque. El texto libre se escribe en
+    `ruta_texto` (Arrow IPC, legible como Feather) a medida que llega. Asi
+    la memoria de trabajo depende del bloque y no del tamaño del CSV; solo
+    se conserva la version compacta del catalogo.
+
+    Los `show_id` repetidos entre bloques se detectan antes, leyendo solo
+    esa columna, para conservar la ultima version como la carga completa.
+
+    Devuelve (df, puente_pais, puente_genero, cubo, cuarentena).
+    """
+    repetidos = (
+        pd.read_csv(ruta, usecols=["show_id"], dtype=TIPOS_CSV)["show_id"]
+        .duplicated(keep="last")
+        .to_numpy()
+    )
+    bloques, paises, generos, cuarentena = [], [], [], []
+    cubos = []
+    escritor = None
+    desplazamiento = 0
+    try:
+        for crudo in pd.read_csv(ruta, dtype=TIPOS_CSV, chunksize=tamaño_bloque):
+            bloque = compactar(
+                limpiar_catalogo(crudo, cuarentena, repetidos[crudo.index])
+            )
+            if ruta_texto is not None:
+                tabla = pa.Table.from_pandas(
+                    bloque[COLUMNAS_TEXTO], preserve_index=False
+                )
+                if escritor is None:
+                    escritor = pa.ipc.new_file(str(ruta_texto), tabla.schema)
+                escritor.write_table(tabla)
+            bloque = bloque.drop(columns=COLUMNAS_TEXTO)
+
+            pais = construir_puente(bloque["country"], "country_list")
+            genero = construir_puente(bloque["listed_in"], "genre_list")
+            cubos.append(construir_cubo(bloque, pais, genero, desplazamiento))
+            if len(cubos) >= CUBOS_POR_COMBINACION:
+                cubos = [combinar_cubos(cubos)]
+
+            pais["fila"] += desplazamiento
+            genero["fila"] += desplazamiento
+            bloques.append(bloque)
+            paises.append(pais)
+            generos.append(genero)
+            desplazamiento += len(bloque)
+    finally:
+        if escritor is not None:
+            escritor.close()
+
+    cubo = combinar_cubos(cubos)
+    return (
+        concatenar(bloques),
+        concatenar(paises),
+        concatenar(generos),
+        cubo,
+        pd.concat(cuarentena, ignore_index=True),
+    )
+
+
+# ── Refresco incremental ──────────────────────────────────────────────────────
+def version_archivo(ruta=RUTA_CATALOGO):
+    """(tamaño, fecha de modificacion) del CSV: cambia si el archivo cambia."""
+    estado = os.stat(ruta)
+    return estado.st_size, estado.st_mtime_ns
+
+
+def _ruta_estado(ruta, directorio_cache):
+    # Por ruta absoluta: dos CSV con el mismo nombre en carpetas distintas
+    # tienen estados distintos
+    clave = hashlib.sha256(str(Path(ruta).resolve()).encode()).hexdigest()[:16]
+    return Path(directorio_cache) / f"{Path(ruta).name}.{clave}.estado.json"
+
+
+def _leer_estado(ruta, directorio_cache):
+    ruta_estado = _ruta_estado(ruta, directorio_cache)
+    if not ruta_estado.exists():
+        return None
+    return json.loads(ruta_estado.read_text())
+
+
+def _generacion(directorio_cache, huella):
+    """Archivos de la cache de una version del CSV (con los de `compartido`)."""
+    directorio = Path(directorio_cache)
+    return [
+        *_rutas_cache(directorio, huella).values(),
+        *_rutas_cubo(directorio, huella).values(),
+        *(r for r in directorio.glob(f"{huella}_*") if r.is_dir()),
+    ]
+
+
+def _escribir_estado(ruta, directorio_cache, huella, leidos, firma, anterior=None):
+    """Registra la carga de `ruta` y borra la generacion del estado `anterior`.
+
+    La escritura es atomica, como en `_escribir_feather`: un proceso que
+    carga el mismo CSV en paralelo lee el estado anterior o el nuevo, nunca
+    uno a medias.
+    """
+    ruta_estado = _ruta_estado(ruta, directorio_cache)
+    temporal = ruta_estado.with_name(f"{ruta_estado.name}.{os.getpid()}.tmp")
+    estado = {"huella": huella, "bytes": leidos, "firma": firma}
+    temporal.write_text(json.dumps(estado))
+    os.replace(temporal, ruta_estado)
+
+    # La generacion anterior ya no se usa, se haya actualizado o reconstruido
+    # (los procesos que la tienen mapeada la siguen leyendo hasta soltarla)
+    if anterior is None or anterior["huella"] == huella:
+        return
+    for r in _generacion(directorio_cache, anterior["huella"]):
+        if r.is_dir():
+            shutil.rmtree(r, ignore_errors=True)
+        else:
+            r.unlink(missing_ok=True)
+
+
+def _leer_agregado(ruta, desde):
+    """Filas agregadas al CSV a partir del byte `desde` (con el encabezado)."""
+    with open(ruta, "rb") as f:
+        encabezado = f.readline()
+        f.seek(desde)
+        nuevo = f.read()
+    return pd.read_csv(io.BytesIO(encabezado + nuevo), dtype=TIPOS_CSV)
+
+
+def _quitar_filas(df, puente_pais, puente_genero, texto, cubo, quitar):
+    """Elimina las filas `quitar` del catalogo, sus puentes y su aporte al cubo."""
+    conservar = np.ones(len(df), dtype=bool)
+    conservar[quitar] = False
+    # Posicion nueva de cada fila; una quitada apunta a la siguiente conservada
+    nueva_posicion = np.cumsum(conservar) - conservar
+
+    # Aporte de las filas quitadas, con conteo negativo
+    viejas = df.iloc[quitar].reset_index(drop=True)
+    posicion_vieja = np.full(len(df), -1)
+    posicion_vieja[quitar] = np.arange(len(quitar))
+
+    def sub_puente(puente):
+        sub = puente[~conservar[puente["fila"].to_numpy()]]
+        return sub.assign(
+            fila=posicion_vieja[sub["fila"].to_numpy()].astype(np.int32)
+        )
+
+    resta = construir_cubo(viejas, sub_puente(puente_pais), sub_puente(puente_genero))
+    for cuboide in resta.values():
+        cuboide["n"] = -cuboide["n"]
+        cuboide["primera"] = np.iinfo(np.int32).max
+    cubo = combinar_cubos([cubo, resta])
+    for cuboide in cubo.values():
+        # Si la primera fila de una celda se quito, la siguiente conservada
+        # es una cota inferior de la nueva (solo afecta el orden de empates)
+        cuboide["primera"] = nueva_posicion[cuboide["primera"].to_numpy()]
+
+    def conservar_puente(puente):
+        puente = puente[conservar[puente["fila"].to_numpy()]]
+        return puente.assign(
+            fila=nueva_posicion[puente["fila"].to_numpy()].astype(np.int32)
+        )
+
+    return (
+        df[conservar].reset_index(drop=True),
+        conservar_puente(puente_pais),
+        conservar_puente(puente_genero),
+        texto[conservar].reset_index(drop=True),
+        cubo,
+    )
+
+
+def _cargar_incremental(ruta, directorio_cache, estado, prefijo):
+    """Catalogo actualizado procesando solo lo agregado al CSV.
+
+    `estado` es el de la ultima carga (tamaño del archivo y firma SHA-256 de
+    todo su contenido) y `prefijo` la firma de los primeros `estado["bytes"]`
+    bytes del archivo actual. Si coinciden, el archivo solo crecio: se
+    parsean los bytes nuevos, los `show_id` repetidos reemplazan a sus
+    versiones anteriores y el cubo se ajusta restando y sumando celdas.
+    Devuelve None si no se puede (sin estado previo, archivo truncado o con
+    cualquier byte ya leido modificado).
+
+    La cuarentena queda igual que en una carga completa. Si lo agregado no
+    reemplaza titulos, es la anterior mas las filas nuevas rechazadas; si
+    reemplaza alguno, su version anterior pasa a la cuarentena como
+    `show_id_duplicado`. Como esa version solo esta completa en el CSV, en
+    ese caso se vuelve a validar el archivo entero (sin limpiarlo ni
+    rearmar puentes y cubo).
+    """
+    if estado is None or prefijo is None or prefijo != estado.get("firma"):
+        return None
+    anteriores = [
+        *_rutas_cache(directorio_cache, estado["huella"]).values(),
+        *_rutas_cubo(directorio_cache, estado["huella"]).values(),
+    ]
+    if not all(r.exists() for r in anteriores):
+        return None
+
+    df, puente_pais, puente_genero, texto, cuarentena, *cuboides = (
+        pd.read_feather(r) for r in anteriores
+    )
+    cubo = dict(zip(CUBOIDES, cuboides))
+
+    # Un show_id repetido es una version nueva del titulo: vale la ultima,
+    # como en la carga completa (si no es valida, el titulo queda solo en la
+    # cuarentena)
+    agregado = _leer_agregado(ruta, estado["bytes"])
+    rechazadas = [cuarentena]
+    nuevo = compactar(limpiar_catalogo(agregado, rechazadas))
+    quitar = np.flatnonzero(df["show_id"].isin(agregado["show_id"]).to_numpy())
+    if len(quitar) or cuarentena["show_id"].isin(agregado["show_id"]).any():
+        crudo = pd.read_csv(ruta, dtype=TIPOS_CSV)
+        rechazadas = [_rechazadas(crudo, validar(crudo)[0])]
+    if len(quitar):
+        df, puente_pais, puente_genero, texto, cubo = _quitar_filas(
+            df, puente_pais, puente_genero, texto, cubo, quitar
+        )
+
+    desplazamiento = len(df)
+    pais = construir_puente(nuevo["country"], "country_list")
+    genero = construir_puente(nuevo["listed_in"], "genre_list")
+    cubo = combinar_cubos([cubo, construir_cubo(nuevo, pais, genero, desplazamiento)])
+    pais["fila"] += desplazamiento
+    genero["fila"] += desplazamiento
+
+    piezas = (
+        concatenar([df, nuevo.drop(columns=COLUMNAS_TEXTO)]),
+        concatenar([puente_pais, pais]),
+        concatenar([puente_genero, genero]),
+        pd.concat([texto, nuevo[COLUMNAS_TEXTO]], ignore_index=True),
+        pd.concat(rechazadas, ignore_index=True),
+        cubo,
+    )
+    return piezas
+
+
+# ── Punto de entrada ──────────────────────────────────────────────────────────
+def cargar_catalogo(
+    ruta=RUTA_CATALOGO,
+    compacto=True,
+    directorio_cache=DIRECTORIO_CACHE,
+    tamaño_bloque=None,
+    incremental=True,
+    mapear=False,
+):
+    """Devuelve (df, puente_pais, puente_genero) listos para el dashboard.
+
+    En modo compacto las columnas repetitivas pasan a `category`, los enteros
+    se reducen y `cast`/`description` salen del frame principal (ver
+    `cargar_textos`). El resultado se guarda en Feather bajo
+    `directorio_cache`, con la huella del CSV en el nombre, y los arranques
+    siguientes leen de ahi sin volver a parsear. Con `directorio_cache=None`
+    no se usa disco.
+
+    Con `tamaño_bloque` el CSV se procesa por bloques (siempre en modo
+    compacto, ver `ingerir_por_bloques`) y el cubo queda en la cache junto
+    al catalogo. Con `incremental`, si el CSV solo crecio desde la ultima
+    carga se procesan unicamente las filas nuevas (ver `_cargar_incremental`).
+
+    Con `mapear` los frames se abren mapeados desde la cache (ver
+    `leer_feather`): varios procesos comparten una sola copia en memoria.
+    """
+    if mapear and directorio_cache is not None:
+        rutas = _rutas_cache(directorio_cache, hash_archivo(ruta))
+        if not all(r.exists() for r in rutas.values()):
+            cargar_catalogo(ruta, True, directorio_cache, tamaño_bloque, incremental)
+        return tuple(
+            leer_feather(rutas[nombre], mapear=True)
+            for nombre in ("catalogo", "pais", "genero")
+        )
+
+    rutas = None
+    if (compacto or tamaño_bloque) and directorio_cache is not None:
+        # Una sola lectura da la huella y la firma de lo leido la ultima vez
+        estado = _leer_estado(ruta, directorio_cache)
+        hasta = estado["bytes"] if incremental and estado is not None else None
+        leidos, firma, prefijo = _firmas_version(ruta, hasta)
+        huella = firma[:20]
+        rutas = _rutas_cache(directorio_cache, huella)
+        if all(r.exists() for r in rutas.values()):
+            return (
+                pd.read_feather(rutas["catalogo"]),
+                pd.read_feather(rutas["pais"]),
+                pd.read_feather(rutas["genero"]),
+            )
+        Path(directorio_cache).mkdir(parents=True, exist_ok=True)
+
+        actualizado = _cargar_incremental(ruta, directorio_cache, estado, prefijo)
+        if actualizado is not None:
+            df, puente_pais, puente_genero, texto, cuarentena, cubo = actualizado
+            for nombre, ruta_cubo in _rutas_cubo(directorio_cache, huella).items():
+                _escribir_feather(cubo[nombre], ruta_cubo)
+            _escribir_feather(df, rutas["catalogo"])
+            _escribir_feather(puente_pais, rutas["pais"])
+            _escribir_feather(puente_genero, rutas["genero"])
+            _escribir_feather(texto, rutas["texto"])
+            _escribir_feather(cuarentena, rutas["cuarentena"])
+            _escribir_estado(ruta, directorio_cache, huella, leidos, firma, estado)
+            return df, puente_pais, puente_genero
+
+    if tamaño_bloque:
+        ruta_texto = None
+        if rutas is not None:
+            ruta_texto = rutas["texto"].with_suffix(f".{os.getpid()}.tmp")
+        df, puente_pais, puente_genero, cubo, cuarentena = ingerir_por_bloques(
+            ruta, tamaño_bloque, ruta_texto
+        )
+        if rutas is not None:
+            for nombre, ruta_cubo in _rutas_cubo(directorio_cache, huella).items():
+                _escribir_feather(cubo[nombre], ruta_cubo)
+            _escribir_feather(df, rutas["catalogo"])
+            _escribir_feather(puente_pais, rutas["pais"])
+            _escribir_feather(puente_genero, rutas["genero"])
+            _escribir_feather(cuarentena, rutas["cuarentena"])
+            os.replace(ruta_texto, rutas["texto"])
+            _escribir_estado(ruta, directorio_cache, huella, leidos, firma, estado)
+        return df, puente_pais, puente_genero
+
+    cuarentena = []
+    df = limpiar_catalogo(pd.read_csv(ruta, dtype=TIPOS_CSV), cuarentena)
+    texto = None
+    if compacto:
+        df = compactar(df)
+        texto = df[COLUMNAS_TEXTO].copy()
+        df = df.drop(columns=COLUMNAS_TEXTO)
+
+    puente_pais = construir_puente(df["country"], "country_list")
+    puente_genero = construir_puente(df["listed_in"], "genre_list")
+
+    if rutas is not None:
+        _escribir_feather(df, rutas["catalogo"])
+        _escribir_feather(puente_pais, rutas["pais"])
+        _escribir_feather(puente_genero, rutas["genero"])
+        _escribir_feather(texto, rutas["texto"])
+        _escribir_feather(cuarentena[0], rutas["cuarentena"])
+        _escribir_estado(ruta, directorio_cache, huella, leidos, firma, estado)
+
+    return df, puente_pais, puente_genero
+
+
+def cubo_en_cache(ruta=RUTA_CATALOGO, directorio_cache=DIRECTORIO_CACHE):
+    """True si el cubo de la version actual de `ruta` ya esta en la cache."""
+    rutas = _rutas_cubo(directorio_cache, hash_archivo(ruta))
+    return all(r.exists() for r in rutas.values())
+
+
+def cargar_cubo(ruta=RUTA_CATALOGO, directorio_cache=DIRECTORIO_CACHE, mapear=False):
+    """Cuboides del catalogo (ver `cubo`), leidos de la cache si existen."""
+    if directorio_cache is None:
+        return construir_cubo(*cargar_catalogo(ruta, directorio_cache=None))
+
+    rutas = _rutas_cubo(directorio_cache, hash_archivo(ruta))
+    if all(r.exists() for r in rutas.values()):
+        return {nombre: leer_feather(r, mapear) for nombre, r in rutas.items()}
+
+    cubo = construir_cubo(*cargar_catalogo(ruta, directorio_cache=directorio_cache))
+    for nombre, ruta_cubo in rutas.items():
+        _escribir_feather(cubo[nombre], ruta_cubo)
+    if mapear:
+        return {nombre: leer_feather(r, mapear) for nombre, r in rutas.items()}
+    return cubo
+
+
+def cargar_textos(
+    ruta=RUTA_CATALOGO, directorio_cache=DIRECTORIO_CACHE, mapear=False
+):
+    """Columnas de texto libre (`cast`, `description`) alineadas por fila."""
+    if directorio_cache is not None:
+        ruta_texto = _rutas_cache(directorio_cache, hash_archivo(ruta))["texto"]
+        if not ruta_texto.exists():
+            cargar_catalogo(ruta, directorio_cache=directorio_cache)
+        return leer_feather(ruta_texto, mapear)
+    df = limpiar_catalogo(pd.read_csv(ruta, dtype=TIPOS_CSV))
+    return df[COLUMNAS_TEXTO]
+
+
+def cargar_cuarentena(ruta=RUTA_CATALOGO, directorio_cache=DIRECTORIO_CACHE):
+    """Filas rechazadas por la validacion, con sus motivos (ver `validar`)."""
+    if directorio_cache is not None:
+        ruta_cuarentena = _rutas_cache(directorio_cache, hash_archivo(ruta))[
+            "cuarentena"
+        ]
+        if not ruta_cuarentena.exists():
+            cargar_catalogo(ruta, directorio_cache=directorio_cache)
+        return pd.read_feather(ruta_cuarentena)
+    cuarentena = []
+    limpiar_catalogo(pd.read_csv(ruta, dtype=TIPOS_CSV), cuarentena)
+    return cuarentena[0]
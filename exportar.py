@@ -0,0 +1,197 @@
+"""Exportacion por lotes de los agregados de las secciones 1 a 5, sin Streamlit.
+
+Recorre una grilla de filtros (tipos × rangos de años × conjuntos de paises)
+con las mismas funciones de `secciones` que usa el panel y escribe una tabla
+Parquet por agregado, con una fila por combinacion y categoria:
+
+    python exportar.py --tipos Movie "TV Show" "Movie,TV Show" \\
+        --años 2000-2021 2015-2021 --paises "" "India,Japan" --salida reportes
+
+Un conjunto de paises vacio toma los 10 principales, como el panel. El cubo
+se arma (o se lee de la cache en disco) una sola vez; cada proceso lo carga
+al iniciar y las secciones que no dependen de los paises se calculan una vez
+por tipo y rango de años.
+"""
+import argparse
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import pandas as pd
+
+import datos
+import secciones
+
+# Valores por defecto del panel
+TOP_N_GENEROS = 10
+TOP_N_AUTORES = 10
+N_PAISES = 10
+N_RATINGS = 8
+
+# Cubo de cada proceso, cargado por `_iniciar`
+_cubo = None
+
+
+# ── Agregados ─────────────────────────────────────────────────────────────────
+def generos_por_pais(cubo, tipos, año_min, año_max, paises):
+    pivot = secciones.generos_por_pais(
+        cubo, tipos, año_min, año_max, paises, TOP_N_GENEROS
+    )
+    return (
+        pivot.rename_axis(index="pais", columns="genero")
+        .stack()
+        .rename("cantidad")
+        .reset_index()
+        .astype({"pais": str, "genero": str, "cantidad": int})
+    )
+
+
+def generos_por_rating(cubo, tipos, año_min, año_max):
+    generos, ratings = secciones.opciones_rating(
+        cubo, tipos, año_min, año_max, TOP_N_GENEROS
+    )
+    return secciones.generos_por_rating(
+        cubo, tipos, año_min, año_max, tuple(generos), tuple(ratings[:N_RATINGS])
+    ).astype({"rating": str})
+
+
+def directores_por_año(cubo, tipos, año_min, año_max):
+    return secciones.directores(cubo, tipos, año_min, año_max, TOP_N_AUTORES)[
+        "por_año"
+    ].astype({"director": str})
+
+
+def duracion_por_pais(cubo, tipos, año_min, año_max, paises):
+    return secciones.duracion_por_pais(cubo, tipos, año_min, año_max, paises)
+
+
+def tiempo_incorporacion(cubo, tipos, año_min, año_max):
+    return secciones.tiempo_incorporacion(cubo, tipos, año_min, año_max)["resumen"]
+
+
+# Agregados que dependen de los paises y los que no
+POR_PAISES = {
+    "generos_por_pais": generos_por_pais,
+    "duracion_por_pais": duracion_por_pais,
+}
+SIN_PAISES = {
+    "generos_por_rating": generos_por_rating,
+    "directores_por_año": directores_por_año,
+    "tiempo_incorporacion": tiempo_incorporacion,
+}
+
+
+# ── Grilla y tareas ───────────────────────────────────────────────────────────
+def _rango(texto):
+    año_min, año_max = (int(a) for a in texto.split("-"))
+    return año_min, año_max
+
+
+def _lista(texto):
+    return tuple(v.strip() for v in texto.split(",") if v.strip())
+
+
+def tareas(grilla_tipos, rangos, conjuntos_paises):
+    """Pares (agregado, filtros) sin repetir los que no usan los paises."""
+    resultado = []
+    for tipos, (año_min, año_max) in itertools.product(grilla_tipos, rangos):
+        for nombre in SIN_PAISES:
+            resultado.append((nombre, (tipos, año_min, año_max)))
+        for nombre, paises in itertools.product(POR_PAISES, conjuntos_paises):
+            resultado.append((nombre, (tipos, año_min, año_max, paises)))
+    return resultado
+
+
+def _iniciar(ruta):
+    global _cubo
+    _cubo = datos.cargar_cubo(ruta)
+
+
+def _calcular(tarea):
+    nombre, filtros = tarea
+    funcion = POR_PAISES.get(nombre) or SIN_PAISES[nombre]
+    tabla = funcion(_cubo, *filtros)
+    tipos, año_min, año_max = filtros[:3]
+    columnas = {"tipos": ",".join(tipos), "año_min": año_min, "año_max": año_max}
+    if nombre in POR_PAISES:
+        columnas["paises"] = ",".join(filtros[3])
+    return nombre, tabla.assign(**columnas)[[*columnas, *tabla.columns]]
+
+
+def exportar(ruta, grilla_tipos, rangos, conjuntos_paises, salida, procesos=None):
+    """Calcula la grilla y escribe `salida/<agregado>.parquet`.
+
+    Devuelve las rutas escritas. Con `procesos` = 1 todo corre en este
+    proceso.
+    """
+    # Deja el cubo en la cache en disco antes de lanzar los procesos: cada
+    # uno lo lee de ahi en `_iniciar` en vez de construirlo
+    datos.cargar_cubo(ruta)
+    pendientes = tareas(grilla_tipos, rangos, conjuntos_paises)
+    procesos = procesos or os.cpu_count()
+    if procesos == 1:
+        _iniciar(ruta)
+        resultados = map(_calcular, pendientes)
+    else:
+        ejecutor = ProcessPoolExecutor(procesos, initializer=_iniciar, initargs=(ruta,))
+        # Varias tareas por envio: cada una tarda poco frente al ida y vuelta
+        bloque = max(1, len(pendientes) // (4 * procesos))
+        resultados = ejecutor.map(_calcular, pendientes, chunksize=bloque)
+
+    tablas = {}
+    try:
+        for nombre, tabla in resultados:
+            tablas.setdefault(nombre, []).append(tabla)
+    finally:
+        if procesos != 1:
+            ejecutor.shutdown()
+
+    salida = Path(salida)
+    salida.mkdir(parents=True, exist_ok=True)
+    rutas = []
+    for nombre, partes in tablas.items():
+        destino = salida / f"{nombre}.parquet"
+        pd.concat(partes, ignore_index=True).to_parquet(destino, index=False)
+        rutas.append(destino)
+    return rutas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--catalogo", default=datos.RUTA_CATALOGO)
+    parser.add_argument(
+        "--tipos", nargs="+", default=["Movie,TV Show"], help="separados por coma"
+    )
+    parser.add_argument(
+        "--años", nargs="+", default=["2000-2021"], help="año_min-año_max"
+    )
+    parser.add_argument(
+        "--paises", nargs="+", default=[""], help="paises separados por coma"
+    )
+    parser.add_argument("--salida", type=Path, default=Path("reportes"))
+    parser.add_argument("--procesos", type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    paises_defecto = tuple(
+        secciones.paises_principales(datos.cargar_catalogo(args.catalogo)[1], N_PAISES)
+    )
+    inicio = time.perf_counter()
+    rutas = exportar(
+        args.catalogo,
+        [_lista(t) for t in args.tipos],
+        [_rango(a) for a in args.años],
+        [_lista(p) or paises_defecto for p in args.paises],
+        args.salida,
+        args.procesos,
+    )
+    for destino in rutas:
+        print(destino)
+    print(f"{time.perf_counter() - inicio:.2f} s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,550 @@
+"""Construccion de los graficos del panel y cache de figuras ya armadas.
+
+Cada funcion de figura recibe solo los datos agregados y los parametros de
+presentacion que usa. `cacheada` guarda la figura construida bajo la huella
+de esos argumentos, de modo que un grafico cuyos datos no cambiaron no se
+vuelve a armar con plotly en el siguiente rerun.
+"""
+import hashlib
+import threading
+import time
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from memo import CacheLRU
+
+# ── Paleta de colores neutral y profesional ───────────────────────────────────
+PALETTE = [
+    "#c0392b", "#2c3e50", "#7f8c8d", "#1a6b8a",
+    "#8e6dbf", "#2980b9", "#e67e22", "#27ae60",
+    "#d35400", "#16a085",
+]
+
+COLORES_TIPO = {"Movie": "#c0392b", "TV Show": "#2c3e50"}
+
+# Limites de la cache de figuras (entradas y vigencia en segundos)
+MAX_FIGURAS = 256
+TTL_SEGUNDOS = 15 * 60
+
+_cache = CacheLRU(MAX_FIGURAS, TTL_SEGUNDOS)
+_ahorro = {}
+_candado = threading.Lock()
+
+
+# ── Cache de figuras ──────────────────────────────────────────────────────────
+def huella(*valores):
+    """Hash del contenido de frames, series y valores simples."""
+    h = hashlib.blake2b(digest_size=16)
+    for valor in valores:
+        _alimentar(h, valor)
+    return h.hexdigest()
+
+
+def _alimentar(h, valor):
+    if isinstance(valor, (pd.DataFrame, pd.Series)):
+        etiquetas = valor.columns if isinstance(valor, pd.DataFrame) else [valor.name]
+        h.update(repr((type(valor).__name__, list(etiquetas), len(valor))).encode())
+        h.update(pd.util.hash_pandas_object(valor, index=True).to_numpy().tobytes())
+    elif isinstance(valor, (list, tuple)):
+        h.update(f"[{len(valor)}".encode())
+        for v in valor:
+            _alimentar(h, v)
+    else:
+        h.update(repr(valor).encode())
+
+
+def cacheada(construir, *args):
+    """`construir(*args)`, reutilizando la figura si los argumentos no cambiaron."""
+    nombre = construir.__name__
+    construida = []
+
+    def calcular():
+        inicio = time.perf_counter()
+        fig = construir(*args)
+        construida.append(True)
+        return fig, time.perf_counter() - inicio
+
+    fig, segundos = _cache.obtener((nombre, huella(*args)), calcular)
+    with _candado:
+        fila = _ahorro.setdefault(
+            nombre, {"aciertos": 0, "fallos": 0, "ahorrado_ms": 0.0}
+        )
+        if construida:
+            fila["fallos"] += 1
+        else:
+            fila["aciertos"] += 1
+            fila["ahorrado_ms"] += segundos * 1000
+    return fig
+
+
+def estadisticas():
+    """Aciertos, fallos y tiempo de construccion ahorrado por grafico."""
+    with _candado:
+        return {nombre: dict(fila) for nombre, fila in _ahorro.items()}
+
+
+# ── Figuras ───────────────────────────────────────────────────────────────────
+def generos_pais(pivot):
+    """Mapa de calor pais × genero (seccion 1)."""
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=pivot.values,
+            x=pivot.columns.tolist(),
+            y=pivot.index.tolist(),
+            colorscale=[
+                [0, "#f7f8fa"],
+                [0.4, "#f5a9a0"],
+                [1, "#c0392b"],
+            ],
+            showscale=True,
+            colorbar=dict(title="Cantidad"),
+        )
+    )
+    fig.update_layout(
+        title="Distribucion de generos por pais (mapa de calor)",
+        xaxis_title="Genero",
+        yaxis_title="Pais",
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        margin=dict(l=20, r=20, t=50, b=20),
+        xaxis=dict(tickangle=-35),
+        height=480,
+    )
+    return fig
+
+
+def generos_rating(gen_rat):
+    """Barras apiladas de generos por rating (seccion 2)."""
+    fig = px.bar(
+        gen_rat,
+        x="rating",
+        y="cantidad",
+        color="genre_list",
+        barmode="stack",
+        labels={"rating": "Clasificacion", "cantidad": "Cantidad", "genre_list": "Genero"},
+        title="Generos por clasificacion de audiencia",
+        color_discrete_sequence=PALETTE,
+    )
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title="Genero", orientation="h", y=-0.35),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=460,
+        xaxis_title="Clasificacion de audiencia",
+        yaxis_title="Cantidad de titulos",
+    )
+    return fig
+
+
+def directores_año(dir_anio, top_n_autores):
+    """Titulos por año de los directores principales (seccion 3)."""
+    fig = px.line(
+        dir_anio,
+        x="release_year",
+        y="titulos",
+        color="director",
+        markers=True,
+        labels={
+            "release_year": "Año de lanzamiento",
+            "titulos": "Numero de titulos",
+            "director": "Director",
+        },
+        title=f"Titulos por año de lanzamiento – Top {top_n_autores} directores",
+        color_discrete_sequence=PALETTE,
+    )
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title="Director", orientation="h", y=-0.4),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=460,
+        xaxis_title="Año de lanzamiento",
+        yaxis_title="Numero de titulos",
+    )
+    return fig
+
+
+def directores_rating(dir_rat_count, orden_dir, top_n_autores, n_directores):
+    """Barras de ratings por director (seccion 3b)."""
+    fig = px.bar(
+        dir_rat_count,
+        x="titulos",
+        y="director",
+        color="rating",
+        orientation="h",
+        barmode="stack",
+        category_orders={"director": orden_dir},
+        labels={
+            "titulos": "Numero de titulos",
+            "director": "Director",
+            "rating": "Clasificacion",
+        },
+        title=f"Clasificaciones por director – Top {top_n_autores}",
+        color_discrete_sequence=PALETTE,
+    )
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title="Clasificacion", orientation="h", y=-0.3),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=max(380, n_directores * 36),
+        xaxis_title="Numero de titulos",
+        yaxis_title="Director",
+    )
+    return fig
+
+
+def matriz_directores(pivot_dr, n_directores):
+    """Mapa de calor director × rating (seccion 3b)."""
+    fig = go.Figure(
+        data=go.Heatmap(
+            z=pivot_dr.values,
+            x=pivot_dr.columns.tolist(),
+            y=pivot_dr.index.tolist(),
+            colorscale=[
+                [0, "#f7f8fa"],
+                [0.4, "#f5a9a0"],
+                [1, "#c0392b"],
+            ],
+            showscale=True,
+            colorbar=dict(title="Titulos"),
+            text=pivot_dr.values,
+            texttemplate="%{text}",
+            textfont=dict(size=10),
+        )
+    )
+    fig.update_layout(
+        title="Matriz director × clasificacion",
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=11, color="#333"),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=max(380, n_directores * 36),
+        xaxis_title="Clasificacion",
+        yaxis_title="Director",
+        xaxis=dict(tickangle=-30),
+    )
+    return fig
+
+
+def duracion_pais(dur_pais, metrica_dur):
+    """Duracion promedio o mediana por pais (seccion 4)."""
+    fig = px.bar(
+        dur_pais,
+        x=metrica_dur,
+        y="Pais",
+        orientation="h",
+        text=dur_pais[metrica_dur].round(1),
+        labels={metrica_dur: "Duracion (minutos)", "Pais": "Pais"},
+        title=f"Duracion {metrica_dur} de peliculas por pais (minutos)",
+        color=metrica_dur,
+        color_continuous_scale=["#f5a9a0", "#c0392b"],
+    )
+    fig.update_traces(textposition="outside")
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        coloraxis_showscale=False,
+        margin=dict(l=20, r=40, t=50, b=20),
+        height=max(380, len(dur_pais) * 32),
+        xaxis_title="Duracion (minutos)",
+        yaxis_title="Pais",
+    )
+    return fig
+
+
+def histograma_tiempo(histograma):
+    """Histograma de años entre lanzamiento e incorporacion (seccion 5).
+
+    Recibe los conteos ya agrupados por año (una barra de ancho 1 por valor),
+    en lugar de un punto por titulo.
+    """
+    fig = px.bar(
+        histograma,
+        x="años_diferencia",
+        y="titulos",
+        color="type",
+        barmode="overlay",
+        opacity=0.8,
+        labels={
+            "años_diferencia": "Años de diferencia",
+            "titulos": "Numero de titulos",
+            "type": "Tipo",
+        },
+        title="Distribucion de tiempo entre lanzamiento e incorporacion",
+        color_discrete_map=COLORES_TIPO,
+    )
+    fig.update_traces(width=1)
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title="Tipo", orientation="h", y=-0.25),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=400,
+        bargap=0,
+        xaxis_title="Años transcurridos",
+        yaxis_title="Numero de titulos",
+    )
+    return fig
+
+
+def dispersion_tiempo(cajas):
+    """Cajas de años transcurridos por tipo (seccion 5).
+
+    Usa los estadisticos precalculados (ver `cubo.resumen_caja`); los
+    atipicos van como puntos aparte.
+    """
+    fig = go.Figure()
+    for caja in cajas.itertuples(index=False):
+        color = COLORES_TIPO.get(caja.type, PALETTE[2])
+        fig.add_trace(
+            go.Box(
+                x=[caja.type],
+                q1=[caja.q1],
+                median=[caja.mediana],
+                q3=[caja.q3],
+                lowerfence=[caja.minimo],
+                upperfence=[caja.maximo],
+                mean=[caja.promedio],
+                sd=[caja.desviacion],
+                name=caja.type,
+                marker_color=color,
+                boxmean="sd",
+                line=dict(width=1.5),
+            )
+        )
+        fig.add_trace(
+            go.Scatter(
+                x=[caja.type] * len(caja.atipicos),
+                y=list(caja.atipicos),
+                mode="markers",
+                marker=dict(color=color, size=5, symbol="circle-open"),
+                name=f"{caja.type} (atipicos)",
+                showlegend=False,
+            )
+        )
+    fig.update_layout(
+        title="Dispersion del tiempo por tipo de contenido",
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title="Tipo"),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=400,
+        yaxis_title="Años transcurridos",
+    )
+    return fig
+
+
+def evolucion_tiempo(df_evol):
+    """Evolucion anual de la diferencia promedio (seccion 5)."""
+    fig = px.line(
+        df_evol,
+        x="year_added",
+        y="años_diferencia",
+        color="type",
+        markers=True,
+        labels={
+            "year_added": "Año de incorporacion a Netflix",
+            "años_diferencia": "Diferencia promedio (años)",
+            "type": "Tipo",
+        },
+        title="Evolucion de la diferencia promedio por año de incorporacion",
+        color_discrete_map=COLORES_TIPO,
+    )
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title="Tipo", orientation="h", y=-0.25),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=380,
+        xaxis_title="Año de incorporacion",
+        yaxis_title="Diferencia promedio (años)",
+    )
+    return fig
+
+
+def ranking_colaboraciones(ranking):
+    """Personas con mas colaboradores distintos (seccion 6)."""
+    fig = px.bar(
+        ranking.iloc[::-1],
+        x="Colaboradores",
+        y="Persona",
+        orientation="h",
+        text="Colaboradores",
+        hover_data=["Titulos compartidos"],
+        title="Personas con mas colaboradores distintos",
+        color="Colaboradores",
+        color_continuous_scale=["#f5a9a0", "#c0392b"],
+    )
+    fig.update_traces(textposition="outside")
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        coloraxis_showscale=False,
+        margin=dict(l=20, r=40, t=50, b=20),
+        height=max(380, len(ranking) * 32),
+        xaxis_title="Colaboradores distintos",
+        yaxis_title="Persona",
+    )
+    return fig
+
+
+def crecimiento_catalogo(crecimiento, etiqueta_ventana):
+    """Tamaño acumulado del catalogo por tipo (seccion 7)."""
+    fig = px.area(
+        crecimiento,
+        x="periodo",
+        y="catalogo",
+        color="type",
+        hover_data={"agregados": True},
+        labels={
+            "periodo": "Periodo",
+            "catalogo": "Titulos en el catalogo",
+            "agregados": f"Agregados ({etiqueta_ventana})",
+            "type": "Tipo",
+        },
+        title="Crecimiento del catalogo",
+        color_discrete_map=COLORES_TIPO,
+    )
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title="Tipo", orientation="h", y=-0.25),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=380,
+        xaxis_title="Fecha de incorporacion",
+        yaxis_title="Titulos en el catalogo",
+    )
+    return fig
+
+
+def series_impulso(series, etiqueta, etiqueta_ventana):
+    """Titulos agregados en la ventana movil por genero o pais (seccion 7)."""
+    fig = px.line(
+        series,
+        x="periodo",
+        y="agregados",
+        color="valor",
+        labels={
+            "periodo": "Periodo",
+            "agregados": f"Agregados ({etiqueta_ventana})",
+            "valor": etiqueta,
+        },
+        title=f"Titulos agregados por {etiqueta.lower()} ({etiqueta_ventana})",
+        color_discrete_sequence=PALETTE,
+    )
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title=etiqueta, orientation="h", y=-0.25),
+        margin=dict(l=20, r=20, t=50, b=20),
+        height=420,
+        xaxis_title="Fecha de incorporacion",
+        yaxis_title=f"Agregados ({etiqueta_ventana})",
+    )
+    return fig
+
+
+def barras_impulso(impulso, etiqueta):
+    """Variacion de la ultima ventana frente a la anterior (seccion 7)."""
+    datos = impulso.dropna(subset=["Variacion %"]).iloc[::-1]
+    fig = px.bar(
+        datos,
+        x="Variacion %",
+        y="Valor",
+        orientation="h",
+        text="Variacion %",
+        hover_data=["Ultima ventana", "Ventana anterior"],
+        title="Impulso: ultima ventana frente a la anterior",
+        color="Variacion %",
+        color_continuous_scale=["#2c3e50", "#dde1e7", "#c0392b"],
+        color_continuous_midpoint=0,
+    )
+    fig.update_traces(texttemplate="%{text:+.1f}%", textposition="outside")
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        coloraxis_showscale=False,
+        margin=dict(l=20, r=40, t=50, b=20),
+        height=max(380, len(datos) * 32),
+        xaxis_title="Variacion (%)",
+        yaxis_title=etiqueta,
+    )
+    return fig
+
+
+def comparacion_matriz(tabla, x, y, valor, etiquetas, titulo, diferencia=False):
+    """Mapas de calor `y` × `x`, uno por catalogo (seccion 8).
+
+    Con `diferencia` la escala es divergente y centrada en cero.
+    """
+    if diferencia:
+        escala = dict(
+            color_continuous_scale=["#2c3e50", "#f7f8fa", "#c0392b"],
+            color_continuous_midpoint=0,
+        )
+    else:
+        escala = dict(color_continuous_scale=["#f7f8fa", "#f5a9a0", "#c0392b"])
+    fig = px.density_heatmap(
+        tabla,
+        x=x,
+        y=y,
+        z=valor,
+        facet_col="catalogo",
+        histfunc="sum",
+        labels={**etiquetas, "catalogo": "Catalogo"},
+        title=titulo,
+        **escala,
+    )
+    fig.for_each_annotation(lambda a: a.update(text=a.text.split("=")[-1]))
+    fig.update_xaxes(tickangle=-35, title=None)
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        coloraxis_colorbar=dict(title=etiquetas[valor]),
+        margin=dict(l=20, r=20, t=70, b=20),
+        height=480,
+    )
+    return fig
+
+
+def comparacion_barras(tabla, x, valor, etiquetas, titulo):
+    """Barras agrupadas de `valor` por `x`, una por catalogo (seccion 8)."""
+    fig = px.bar(
+        tabla,
+        x=x,
+        y=valor,
+        color="catalogo",
+        barmode="group",
+        labels={**etiquetas, "catalogo": "Catalogo"},
+        title=titulo,
+        color_discrete_sequence=PALETTE,
+    )
+    fig.update_layout(
+        plot_bgcolor="#ffffff",
+        paper_bgcolor="#ffffff",
+        font=dict(family="Segoe UI", size=12, color="#333"),
+        legend=dict(title="Catalogo", orientation="h", y=-0.3),
+        margin=dict(l=20, r=20, t=50, b=20),
+        xaxis=dict(tickangle=-35),
+        height=420,
+        xaxis_title=etiquetas[x],
+        yaxis_title=etiquetas[valor],
+    )
+    return fig
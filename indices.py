@@ -0,0 +1,100 @@
+"""Indices invertidos sobre el catalogo para resolver los filtros sin mascaras.
+
+Cada indice guarda, para cada valor distinto de una columna, la lista ordenada
+de filas (posiciones en `df`) que lo contienen. Los filtros se responden
+uniendo e intersectando esas listas, con un costo que depende del tamaño del
+resultado y no del catalogo completo.
+"""
+from collections import namedtuple
+from functools import reduce
+
+import numpy as np
+import pandas as pd
+
+# valores: valores distintos, ordenados
+# filas:   ids de fila agrupados por valor (ordenados dentro de cada grupo)
+# limites: filas[limites[i]:limites[i + 1]] son las filas con valores[i]
+Indice = namedtuple("Indice", ["valores", "filas", "limites"])
+
+VACIO = np.empty(0, dtype=np.int32)
+
+
+def indice_invertido(valores_fila, filas=None):
+    """Construye el indice valor → filas a partir de pares (fila, valor)."""
+    categoria = pd.Categorical(valores_fila)
+    codigos = categoria.codes.astype(np.int64)
+    if filas is None:
+        filas = np.arange(len(codigos), dtype=np.int32)
+    validos = codigos >= 0
+    codigos, filas = codigos[validos], np.asarray(filas, dtype=np.int32)[validos]
+
+    orden = np.lexsort((filas, codigos))
+    limites = np.zeros(len(categoria.categories) + 1, dtype=np.int64)
+    limites[1:] = np.cumsum(
+        np.bincount(codigos, minlength=len(categoria.categories))
+    )
+    return Indice(pd.Index(categoria.categories), filas[orden], limites)
+
+
+def limites_por_fila(puente, n_filas):
+    """Indice directo fila → tramo de la tabla puente (ordenada por fila)."""
+    return np.searchsorted(puente["fila"].to_numpy(), np.arange(n_filas + 1))
+
+
+def construir_indices(df, puente_pais, puente_genero):
+    """Indices de los filtros del panel: tipo, año, rating, pais y genero."""
+    return {
+        "type": indice_invertido(df["type"]),
+        "release_year": indice_invertido(df["release_year"]),
+        "rating": indice_invertido(df["rating"]),
+        "country_list": indice_invertido(
+            puente_pais["country_list"], puente_pais["fila"].to_numpy()
+        ),
+        "genre_list": indice_invertido(
+            puente_genero["genre_list"], puente_genero["fila"].to_numpy()
+        ),
+        "tramos_pais": limites_por_fila(puente_pais, len(df)),
+        "tramos_genero": limites_por_fila(puente_genero, len(df)),
+    }
+
+
+# ── Consultas ─────────────────────────────────────────────────────────────────
+def filas_con(indice, valores):
+    """Filas (ordenadas y sin repetir) que tienen alguno de `valores`."""
+    codigos = indice.valores.get_indexer(list(valores))
+    partes = [
+        indice.filas[indice.limites[c]:indice.limites[c + 1]]
+        for c in codigos
+        if c >= 0
+    ]
+    if not partes:
+        return VACIO
+    if len(partes) == 1:
+        return np.unique(partes[0])
+    return np.unique(np.concatenate(partes))
+
+
+def filas_entre(indice, minimo, maximo):
+    """Filas con valor en [minimo, maximo]: un tramo contiguo del indice."""
+    i = indice.valores.searchsorted(minimo, side="left")
+    j = indice.valores.searchsorted(maximo, side="right")
+    return np.sort(indice.filas[indice.limites[i]:indice.limites[j]])
+
+
+def intersectar(*conjuntos):
+    """Interseccion de listas ordenadas de filas."""
+    return reduce(
+        lambda a, b: np.intersect1d(a, b, assume_unique=True), conjuntos
+    )
+
+
+def posiciones(inicios, largos):
+    """Posiciones de los tramos [inicio, inicio + largo) concatenados, sin bucle."""
+    desplazamiento = np.repeat(inicios - np.cumsum(largos) + largos, largos)
+    return desplazamiento + np.arange(largos.sum())
+
+
+def tramos_de(puente, tramos, filas):
+    """Filas de la tabla puente que corresponden a los titulos `filas`."""
+    inicios = tramos[filas]
+    return puente.iloc[posiciones(inicios, tramos[filas + 1] - inicios)]
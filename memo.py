@@ -0,0 +1,115 @@
+"""Memoizacion acotada (LRU + TTL) con contadores de aciertos y fallos.
+
+Los resultados se comparten entre todas las sesiones del servidor, asi que
+quien los recibe no debe modificarlos.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+
+# Todas las caches creadas con `memoizar`, por nombre de funcion
+REGISTRO = {}
+
+
+class _Identidad:
+    """Clave para argumentos no hashables (frames, dicts): se comparan por id.
+
+    Mantiene la referencia al objeto, de modo que su id no se reutiliza
+    mientras la entrada siga en la cache.
+    """
+
+    __slots__ = ("objeto",)
+
+    def __init__(self, objeto):
+        self.objeto = objeto
+
+    def __hash__(self):
+        return id(self.objeto)
+
+    def __eq__(self, otro):
+        return isinstance(otro, _Identidad) and otro.objeto is self.objeto
+
+
+def _congelar(valor):
+    if isinstance(valor, (list, tuple)):
+        return tuple(_congelar(v) for v in valor)
+    if isinstance(valor, (set, frozenset)):
+        return frozenset(valor)
+    try:
+        hash(valor)
+    except TypeError:
+        return _Identidad(valor)
+    return valor
+
+
+class CacheLRU:
+    """Cache de tamaño maximo `max_entradas` cuyas entradas vencen a los `ttl` s."""
+
+    def __init__(self, max_entradas=128, ttl=None):
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self._entradas = OrderedDict()
+        self._candado = threading.Lock()
+
+    def obtener(self, clave, calcular):
+        ahora = time.monotonic()
+        with self._candado:
+            entrada = self._entradas.get(clave)
+            if entrada is not None and (self.ttl is None or entrada[0] > ahora):
+                self._entradas.move_to_end(clave)
+                self.aciertos += 1
+                return entrada[1]
+            self.fallos += 1
+
+        valor = calcular()
+        vence = ahora + self.ttl if self.ttl is not None else None
+        with self._candado:
+            self._entradas[clave] = (vence, valor)
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+                self.expulsiones += 1
+        return valor
+
+    def limpiar(self):
+        with self._candado:
+            self._entradas.clear()
+
+    def estadisticas(self):
+        with self._candado:
+            return {
+                "aciertos": self.aciertos,
+                "fallos": self.fallos,
+                "entradas": len(self._entradas),
+                "expulsiones": self.expulsiones,
+            }
+
+
+def memoizar(max_entradas=128, ttl=None):
+    """Decorador: memoiza la funcion en una `CacheLRU` propia.
+
+    La funcion original queda en `__wrapped__` y la cache en `cache`.
+    """
+
+    def decorador(funcion):
+        cache = CacheLRU(max_entradas, ttl)
+        REGISTRO[funcion.__name__] = cache
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            clave = (_congelar(args), _congelar(sorted(kwargs.items())))
+            return cache.obtener(clave, lambda: funcion(*args, **kwargs))
+
+        envoltura.cache = cache
+        return envoltura
+
+    return decorador
+
+
+def estadisticas():
+    """Aciertos, fallos, entradas y expulsiones de cada cache registrada."""
+    return {nombre: cache.estadisticas() for nombre, cache in REGISTRO.items()}
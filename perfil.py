@@ -0,0 +1,177 @@
+"""Perfilado opcional de cada rerun del panel, sin Streamlit.
+
+Un `Perfil` toma el tiempo de cada etapa (carga, filtro, preparacion de cada
+seccion, construccion y dibujo de graficos), las filas y el tamaño de lo que
+devuelve y la variacion de memoria del proceso. Al cerrar el rerun agrega
+una linea JSON al registro, que `resumir` agrega entre sesiones:
+
+    python perfil.py [registro.jsonl]      # p50 / p95 / max por etapa
+                                           # y reruns por motivo
+"""
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+RUTA_REGISTRO = Path(".perfil") / "reruns.jsonl"
+
+_PAGINA = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def memoria_mb():
+    """Memoria residente del proceso, o None si no se puede leer."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * _PAGINA / 2**20
+    except OSError:
+        return None
+
+
+def _tamaño(resultado):
+    """Filas y MB de un frame, serie o dict/tupla de ellos (None si no aplica)."""
+    if isinstance(resultado, (pd.DataFrame, pd.Series)):
+        return len(resultado), resultado.memory_usage(deep=True).sum() / 2**20
+    if isinstance(resultado, dict):
+        resultado = list(resultado.values())
+    if isinstance(resultado, (list, tuple)):
+        partes = [_tamaño(r) for r in resultado]
+        partes = [p for p in partes if p[0] is not None]
+        if partes:
+            return max(p[0] for p in partes), sum(p[1] for p in partes)
+    return None, None
+
+
+class Perfil:
+    """Etapas medidas en un rerun. Inactivo, no mide ni escribe nada."""
+
+    def __init__(self, activo=False, sesion=None, registro=RUTA_REGISTRO):
+        self.activo = activo
+        self.sesion = sesion
+        self.registro = Path(registro)
+        self.etapas = []
+        self._inicio = time.perf_counter()
+
+    @contextmanager
+    def etapa(self, nombre):
+        """Mide el bloque `with` como la etapa `nombre`."""
+        if not self.activo:
+            yield
+            return
+        memoria = memoria_mb()
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._agregar(nombre, inicio, memoria)
+
+    def medir(self, nombre, funcion, *args, **kwargs):
+        """Llama a `funcion` como la etapa `nombre` y registra su resultado."""
+        if not self.activo:
+            return funcion(*args, **kwargs)
+        memoria = memoria_mb()
+        inicio = time.perf_counter()
+        resultado = funcion(*args, **kwargs)
+        self._agregar(nombre, inicio, memoria, resultado)
+        return resultado
+
+    def _agregar(self, nombre, inicio, memoria, resultado=None):
+        ms = (time.perf_counter() - inicio) * 1000
+        final = memoria_mb()
+        filas, mb = _tamaño(resultado)
+        self.etapas.append(
+            {
+                "etapa": nombre,
+                "ms": round(ms, 3),
+                "filas": filas,
+                "resultado_mb": None if mb is None else round(mb, 3),
+                "delta_mb": None if memoria is None else round(final - memoria, 3),
+            }
+        )
+
+    def tabla(self):
+        return pd.DataFrame(
+            self.etapas, columns=["etapa", "ms", "filas", "resultado_mb", "delta_mb"]
+        )
+
+    def cerrar(self, **contexto):
+        """Agrega el rerun al registro (una linea JSON) y devuelve el total en ms."""
+        total = (time.perf_counter() - self._inicio) * 1000
+        if not self.activo:
+            return total
+        linea = {
+            "momento": time.time(),
+            "sesion": self.sesion,
+            "pid": os.getpid(),
+            "total_ms": round(total, 3),
+            "memoria_mb": memoria_mb(),
+            **contexto,
+            "etapas": self.etapas,
+        }
+        self.registro.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.registro, "a", encoding="utf-8") as f:
+            f.write(json.dumps(linea, default=str) + "\n")
+        return total
+
+
+def resumir(registro=RUTA_REGISTRO):
+    """Reruns, p50, p95 y maximo en ms por etapa (y del total) en el registro."""
+    filas = []
+    with open(registro, encoding="utf-8") as f:
+        for linea in f:
+            rerun = json.loads(linea)
+            filas.append({"etapa": "TOTAL", "ms": rerun["total_ms"]})
+            filas.extend({"etapa": e["etapa"], "ms": e["ms"]} for e in rerun["etapas"])
+    tiempos = pd.DataFrame(filas, columns=["etapa", "ms"]).groupby("etapa")["ms"]
+    return (
+        pd.DataFrame(
+            {
+                "reruns": tiempos.size(),
+                "p50": tiempos.quantile(0.5),
+                "p95": tiempos.quantile(0.95),
+                "max": tiempos.max(),
+            }
+        )
+        .sort_values("p95", ascending=False)
+        .round(1)
+    )
+
+
+def resumir_reruns(registro=RUTA_REGISTRO):
+    """Reruns completos por motivo (filtros aplicados, pestañas, etc.).
+
+    `iniciados` sale del contador de cada sesion (`reruns_sesion`), que
+    tambien cuenta los reruns interrumpidos por uno mas nuevo: la diferencia
+    con el total son los que no llegaron al final.
+    """
+    with open(registro, encoding="utf-8") as f:
+        reruns = pd.DataFrame(
+            [json.loads(linea) for linea in f],
+            columns=["sesion", "motivo", "reruns_sesion"],
+        )
+    reruns["motivo"] = reruns["motivo"].fillna("sin_motivo")
+    resumen = pd.concat(
+        [
+            reruns.groupby("motivo").agg(
+                reruns=("sesion", "size"), sesiones=("sesion", "nunique")
+            ),
+            pd.DataFrame(
+                {"reruns": [len(reruns)], "sesiones": [reruns["sesion"].nunique()]},
+                index=["TOTAL"],
+            ),
+        ]
+    )
+    resumen["por_sesion"] = (resumen["reruns"] / resumen["sesiones"]).round(2)
+    iniciados = reruns.groupby("sesion")["reruns_sesion"].max().sum()
+    resumen["iniciados"] = pd.Series({"TOTAL": iniciados}, dtype="Int64")
+    return resumen
+
+
+if __name__ == "__main__":
+    ruta = sys.argv[1] if len(sys.argv) > 1 else RUTA_REGISTRO
+    print(resumir(ruta).to_string())
+    print()
+    print(resumir_reruns(ruta).to_string())
@@ -0,0 +1,482 @@
+"""Preparacion de datos de cada seccion del panel, sin Streamlit.
+
+Cada funcion es pura y depende solo de los filtros que usa su seccion, de
+modo que cambiar un widget ajeno es un acierto de cache. Los resultados se
+comparten entre sesiones (ver `memo`) y no deben modificarse.
+"""
+from concurrent.futures import Future
+
+import numpy as np
+import pandas as pd
+
+from busqueda import buscar
+from comparacion import alinear
+from cubo import acotar, enrollar, ranking, rebanar, resumen_caja, resumen_histograma
+from datos import SIN_PERSONA
+from grafo import adyacencia, colaboradores, componentes, grados
+from indices import filas_con, filas_entre, intersectar, tramos_de
+from memo import memoizar
+from similares import similares
+from tendencias import acumulado, agregados, tramo, ventana_movil
+
+# Limites de las caches: entradas por funcion y vigencia en segundos
+MAX_ENTRADAS = 128
+TTL_SEGUNDOS = 15 * 60
+
+# Rango de años de diferencia que se grafica en la seccion 5
+RANGO_DIFERENCIA = (-2, 30)
+
+# Tope de categorias por eje (el resto se suma en "Otros") y de valores
+# atipicos por caja: acotan lo que se envia al navegador
+MAX_CATEGORIAS = 20
+MAX_ATIPICOS = 50
+
+
+# ── Ejecucion ─────────────────────────────────────────────────────────────────
+def lanzar(ejecutor, funcion, *args):
+    """Calcula `funcion(*args)` en `ejecutor` y devuelve el `Future`.
+
+    Sin ejecutor se calcula en el momento, de modo que quien consume el
+    resultado lo hace igual (`.result()`) en serie o en paralelo.
+    """
+    if ejecutor is not None:
+        return ejecutor.submit(funcion, *args)
+    futuro = Future()
+    try:
+        futuro.set_result(funcion(*args))
+    except Exception as error:
+        futuro.set_exception(error)
+    return futuro
+
+
+def cancelar(futuros):
+    """Cancela los calculos de `futuros` que todavia no empezaron.
+
+    Los que ya corren terminan (y dejan su resultado en cache); los demas
+    salen de la cola del ejecutor sin ocupar un hilo.
+    """
+    return sum(futuro.cancel() for futuro in futuros)
+
+
+# ── Filtro base y metricas ────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def filtro_base(indices, tipos, año_min, año_max):
+    """Filas del catalogo con el tipo y el año de lanzamiento elegidos."""
+    return intersectar(
+        filas_con(indices["type"], tipos),
+        filas_entre(indices["release_year"], año_min, año_max),
+    )
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def metricas(indices, puente_pais, tipos, año_min, año_max):
+    """Totales de la fila de metricas resumen."""
+    filas = filtro_base(indices, tipos, año_min, año_max)
+    paises = tramos_de(puente_pais, indices["tramos_pais"], filas)
+    return {
+        "titulos": len(filas),
+        "peliculas": len(intersectar(filas, filas_con(indices["type"], ["Movie"]))),
+        "series": len(intersectar(filas, filas_con(indices["type"], ["TV Show"]))),
+        "paises": paises["country_list"].nunique(),
+    }
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def paises_principales(puente_pais, k=30):
+    """Los `k` paises con mas titulos en todo el catalogo."""
+    return puente_pais["country_list"].value_counts().head(k).index.tolist()
+
+
+# ── Buscador ──────────────────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def busqueda(indice_texto, df, indices, consulta, tipos, año_min, año_max, k=50):
+    """Titulos que contienen la consulta, dentro de los filtros, por puntaje."""
+    filas, puntajes = buscar(
+        indice_texto, consulta, filtro_base(indices, tipos, año_min, año_max), k
+    )
+    return (
+        df.iloc[filas][["title", "type", "release_year", "director"]]
+        .astype({"type": str})
+        .assign(puntaje=puntajes.round(2))
+        .rename(
+            columns={
+                "title": "Titulo",
+                "type": "Tipo",
+                "release_year": "Año",
+                "director": "Director",
+                "puntaje": "Puntaje",
+            }
+        )
+    )
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def titulos_similares(
+    indice_similares, df, indices, fila, tipos, año_min, año_max, k=10
+):
+    """Los `k` titulos mas parecidos a la fila `fila`, dentro de los filtros."""
+    filas, puntajes = similares(
+        indice_similares, fila, filtro_base(indices, tipos, año_min, año_max), k
+    )
+    return (
+        df.iloc[filas][["title", "type", "release_year", "listed_in"]]
+        .astype({"type": str, "listed_in": str})
+        .assign(similitud=puntajes.round(3))
+        .rename(
+            columns={
+                "title": "Titulo",
+                "type": "Tipo",
+                "release_year": "Año",
+                "listed_in": "Generos",
+                "similitud": "Similitud",
+            }
+        )
+    )
+
+
+# ── Seccion 1 ─────────────────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def generos_por_pais(cubo, tipos, año_min, año_max, paises, top_n_generos):
+    """Matriz pais × genero con los `top_n_generos` generos mas frecuentes."""
+    celdas = rebanar(cubo["pais_genero"], tipos, año_min, año_max)
+    celdas = celdas[celdas["country_list"].isin(paises)]
+    heatmap_data = enrollar(celdas, ["country_list", "genre_list"], "cantidad")
+
+    # Top géneros globales para eje
+    top_generos_global = (
+        heatmap_data.groupby("genre_list", observed=True)["cantidad"]
+        .sum()
+        .nlargest(top_n_generos)
+        .index.tolist()
+    )
+    heatmap_data = heatmap_data[heatmap_data["genre_list"].isin(top_generos_global)]
+    return heatmap_data.pivot_table(
+        index="country_list", columns="genre_list", values="cantidad", fill_value=0
+    )
+
+
+# ── Seccion 2 ─────────────────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def opciones_rating(cubo, tipos, año_min, año_max, top_n_generos):
+    """Generos mas frecuentes y ratings presentes en la seleccion."""
+    celdas = rebanar(cubo["rating_genero"], tipos, año_min, año_max)
+    generos_freq = ranking(celdas, "genre_list").head(top_n_generos).index.tolist()
+    ratings_disponibles = sorted(
+        enrollar(celdas, ["rating"])["rating"].astype(str).tolist()
+    )
+    return generos_freq, ratings_disponibles
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def generos_por_rating(cubo, tipos, año_min, año_max, generos, ratings):
+    """Conteo de titulos por (rating, genero) para los valores elegidos."""
+    celdas = rebanar(cubo["rating_genero"], tipos, año_min, año_max)
+    celdas = celdas[
+        celdas["genre_list"].isin(generos) & celdas["rating"].isin(ratings)
+    ]
+    celdas = acotar(celdas, "rating", MAX_CATEGORIAS)
+    gen_rat = enrollar(celdas, ["rating", "genre_list"], "cantidad")
+    gen_rat["genre_list"] = gen_rat["genre_list"].astype(str)
+    return gen_rat
+
+
+# ── Secciones 3 y 3b ──────────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def directores(cubo, tipos, año_min, año_max, top_n_autores):
+    """Conteos por año y por rating de los directores con mas titulos."""
+    celdas = rebanar(cubo["director"], tipos, año_min, año_max)
+    celdas = celdas[celdas["director"] != SIN_PERSONA]
+    conteo_dir = ranking(celdas, "director").head(top_n_autores)
+    top_directores = conteo_dir.index.tolist()
+    celdas_top = celdas[celdas["director"].isin(top_directores)]
+
+    dir_rat_count = enrollar(
+        acotar(celdas_top, "rating", MAX_CATEGORIAS), ["director", "rating"], "titulos"
+    )
+    # Ordenar directores por total de titulos (mayor arriba)
+    orden_dir = (
+        dir_rat_count.groupby("director", observed=True)["titulos"]
+        .sum()
+        .sort_values(ascending=False)
+        .index.tolist()
+    )
+    # Mapa de calor director × rating
+    pivot_dr = (
+        dir_rat_count.set_index(["director", "rating"])["titulos"]
+        .unstack(fill_value=0)
+        .sort_index(axis=1)
+    )
+    # Mantener solo ratings con al menos un título
+    pivot_dr = pivot_dr.loc[:, pivot_dr.sum() > 0]
+    pivot_dr = pivot_dr.loc[orden_dir]  # Mismo orden que el bar
+
+    tabla_dir = (
+        conteo_dir.reset_index()
+        .rename(columns={"director": "Director", "n": "Titulos"})
+        .astype({"Director": str})
+    )
+    return {
+        "top_directores": top_directores,
+        "tabla": tabla_dir,
+        "por_año": enrollar(celdas_top, ["release_year", "director"], "titulos"),
+        "por_rating": dir_rat_count,
+        "orden": orden_dir,
+        "matriz": pivot_dr,
+    }
+
+
+# ── Seccion 4 ─────────────────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def duracion_por_pais(cubo, tipos, año_min, año_max, paises):
+    """Promedio, mediana y cantidad de duraciones de peliculas por pais.
+
+    Sin paises elegidos se usan los 20 con mas peliculas.
+    """
+    celdas = rebanar(cubo["duracion"], tipos, año_min, año_max)
+    if not paises:
+        paises = ranking(celdas, "country_list").head(20).index.tolist()
+    celdas = celdas[celdas["country_list"].isin(paises)]
+    return (
+        resumen_histograma(celdas, ["country_list"], "duracion_min")
+        .rename(columns={"country_list": "Pais"})
+        [["Pais", "promedio", "mediana", "cantidad"]]
+        .sort_values("promedio", ascending=True)
+    )
+
+
+# ── Seccion 5 ─────────────────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def tiempo_incorporacion(cubo, tipos, año_min, año_max):
+    """Histograma, cajas y resumen por tipo y evolucion anual.
+
+    Todo sale del histograma del cubo: el tamaño del resultado depende del
+    rango de diferencias, no de la cantidad de titulos.
+    """
+    minimo, maximo = RANGO_DIFERENCIA
+    celdas = rebanar(cubo["tiempo"], tipos, año_min, año_max)
+    celdas = celdas[celdas["años_diferencia"].between(minimo, maximo)]
+
+    histograma = enrollar(celdas, ["type", "años_diferencia"], "titulos")
+    histograma["type"] = histograma["type"].astype(str)
+    cajas = resumen_caja(celdas, ["type"], "años_diferencia", MAX_ATIPICOS)
+    cajas["type"] = cajas["type"].astype(str)
+
+    resumen_tipo = (
+        resumen_histograma(celdas, ["type"], "años_diferencia")
+        .drop(columns="cantidad")
+        .rename(
+            columns={
+                "type": "Tipo",
+                "promedio": "Promedio",
+                "mediana": "Mediana",
+                "desviacion": "Desv. Estandar",
+            }
+        )
+    )
+    resumen_tipo[["Promedio", "Mediana", "Desv. Estandar"]] = resumen_tipo[
+        ["Promedio", "Mediana", "Desv. Estandar"]
+    ].round(2)
+
+    # El año de incorporacion se deduce de la celda: lanzamiento + diferencia
+    df_evol = (
+        resumen_histograma(
+            celdas.assign(
+                year_added=celdas["release_year"]
+                + celdas["años_diferencia"].astype(np.int64)
+            ),
+            ["year_added", "type"],
+            "años_diferencia",
+        )
+        .rename(columns={"promedio": "años_diferencia"})
+        [["year_added", "type", "años_diferencia"]]
+    )
+    df_evol["year_added"] = df_evol["year_added"].astype(int)
+    return {
+        "histograma": histograma,
+        "cajas": cajas,
+        "resumen": resumen_tipo,
+        "evolucion": df_evol,
+    }
+
+
+# ── Seccion 6 ─────────────────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def red_colaboraciones(grafo, indices, tipos, año_min, año_max, k):
+    """Red de colaboraciones de los titulos filtrados: resumen y ranking.
+
+    El ranking ordena a las `k` personas con mas colaboradores distintos.
+    """
+    ady = adyacencia(grafo, filtro_base(indices, tipos, año_min, año_max))
+    distintos, compartidos = grados(ady)
+    activas = np.flatnonzero(distintos)
+    _, tamaños = np.unique(componentes(ady)[activas], return_counts=True)
+    orden = activas[np.lexsort((activas, -compartidos[activas], -distintos[activas]))]
+    ranking = pd.DataFrame(
+        {
+            "Persona": grafo.personas[orden[:k]].astype(str),
+            "Colaboradores": distintos[orden[:k]],
+            "Titulos compartidos": compartidos[orden[:k]].astype(int),
+        }
+    )
+    resumen = {
+        "personas": len(activas),
+        "colaboraciones": len(ady.vecinos) // 2,
+        "componentes": len(tamaños),
+        "mayor_componente": tamaños.max() / len(activas) if len(activas) else 0.0,
+    }
+    return {"adyacencia": ady, "ranking": ranking, "resumen": resumen}
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def colaboradores_de(grafo, ady, persona, k=10):
+    """Los `k` colaboradores con mas titulos compartidos con `persona`.
+
+    Una persona que no esta en el grafo no tiene colaboradores.
+    """
+    id_persona = np.searchsorted(grafo.personas, persona)
+    if id_persona == len(grafo.personas) or grafo.personas[id_persona] != persona:
+        vecinos, pesos = np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    else:
+        vecinos, pesos = colaboradores(ady, id_persona, k)
+    return pd.DataFrame(
+        {
+            "Colaborador": grafo.personas[vecinos].astype(str),
+            "Titulos compartidos": pesos,
+        }
+    )
+
+
+# ── Seccion 7 ─────────────────────────────────────────────────────────────────
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def crecimiento_catalogo(tendencias, tipos, desde, hasta, granularidad, ventana):
+    """Tamaño del catalogo y titulos agregados en la ventana movil, por tipo."""
+    tendencia = tendencias[granularidad]["total"]
+    i, j = tramo(tendencia, desde, hasta)
+    elegidos = np.isin(tendencia.tipos, list(tipos))
+    tipos = tendencia.tipos[elegidos]
+    # Una fila por tipo (ninguna si no se eligio ninguno): la dimension
+    # "total" tiene un solo valor
+    acumulados = tendencia.acumulado[elegidos, 0]
+    n_periodos = j - i
+    return pd.DataFrame(
+        {
+            "periodo": np.tile(tendencia.fechas[i:j], len(tipos)),
+            "type": np.repeat(tipos, n_periodos),
+            "catalogo": acumulados[:, i + 1 : j + 1].ravel(),
+            "agregados": ventana_movil(acumulados, ventana)[:, i:j].ravel(),
+        }
+    )
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def impulso(tendencias, dimension, tipos, desde, hasta, granularidad, ventana, k):
+    """Series moviles e impulso de los `k` valores con mas titulos en el rango.
+
+    El impulso compara los titulos agregados en la ultima ventana del rango
+    con los de la ventana anterior: todo son restas de acumulados.
+    """
+    tendencia = tendencias[granularidad][dimension]
+    i, j = tramo(tendencia, desde, hasta)
+    acumulados = acumulado(tendencia, tipos)
+    en_rango = agregados(acumulados, i, j)
+    principales = np.lexsort((tendencia.valores, -en_rango))[:k]
+    principales = principales[en_rango[principales] > 0]
+
+    moviles = ventana_movil(acumulados[principales], ventana)[:, i:j]
+    valores = tendencia.valores[principales].astype(str)
+    series = pd.DataFrame(
+        {
+            "periodo": np.tile(tendencia.fechas[i:j], len(principales)),
+            "valor": np.repeat(valores, j - i),
+            "agregados": moviles.ravel(),
+        }
+    )
+
+    corte, anterior = max(j - ventana, i), max(j - 2 * ventana, i)
+    recientes = agregados(acumulados[principales], corte, j)
+    previos = agregados(acumulados[principales], anterior, corte)
+    variacion = np.divide(
+        recientes - previos,
+        previos,
+        out=np.full(len(principales), np.nan),
+        where=previos > 0,
+    )
+    tabla = pd.DataFrame(
+        {
+            "Valor": valores,
+            "En el rango": en_rango[principales],
+            "Ultima ventana": recientes,
+            "Ventana anterior": previos,
+            "Variacion %": (variacion * 100).round(1),
+        }
+    ).sort_values("Variacion %", ascending=False, na_position="last")
+    return {"series": series, "impulso": tabla}
+
+
+# ── Seccion 8 ─────────────────────────────────────────────────────────────────
+# Los catalogos comparados comparten un cubo apilado (ver `comparacion`): cada
+# consulta rebana una vez para todos y elige las categorias por el total
+
+
+def _catalogos(apilado):
+    return apilado["tiempo"]["catalogo"].cat.categories.tolist()
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def comparar_generos_por_pais(apilado, tipos, año_min, año_max, paises, top_n_generos):
+    """Titulos por catalogo, pais y genero (los `top_n_generos` del total)."""
+    celdas = rebanar(apilado["pais_genero"], tipos, año_min, año_max)
+    celdas = celdas[celdas["country_list"].isin(paises)]
+    generos = ranking(celdas, "genre_list").head(top_n_generos).index
+    celdas = celdas[celdas["genre_list"].isin(generos)]
+    tabla = enrollar(celdas, ["catalogo", "country_list", "genre_list"], "cantidad")
+    return alinear(tabla, ["cantidad"], _catalogos(apilado))
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def comparar_generos_por_rating(apilado, tipos, año_min, año_max, top_n_generos):
+    """Titulos por catalogo, rating y genero (los `top_n_generos` del total)."""
+    celdas = rebanar(apilado["rating_genero"], tipos, año_min, año_max)
+    generos = ranking(celdas, "genre_list").head(top_n_generos).index
+    celdas = celdas[celdas["genre_list"].isin(generos)]
+    celdas = acotar(celdas, "rating", MAX_CATEGORIAS)
+    tabla = enrollar(celdas, ["catalogo", "rating", "genre_list"], "cantidad")
+    return alinear(tabla, ["cantidad"], _catalogos(apilado))
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def comparar_directores(apilado, tipos, año_min, año_max, top_n_autores):
+    """Titulos por catalogo de los `top_n_autores` directores del total."""
+    celdas = rebanar(apilado["director"], tipos, año_min, año_max)
+    celdas = celdas[celdas["director"] != SIN_PERSONA]
+    top_directores = ranking(celdas, "director").head(top_n_autores).index
+    celdas = celdas[celdas["director"].isin(top_directores)]
+    tabla = enrollar(celdas, ["catalogo", "director"], "titulos")
+    return alinear(tabla, ["titulos"], _catalogos(apilado))
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def comparar_duracion(apilado, tipos, año_min, año_max, paises):
+    """Promedio, mediana y cantidad de duraciones por catalogo y pais."""
+    celdas = rebanar(apilado["duracion"], tipos, año_min, año_max)
+    celdas = celdas[celdas["country_list"].isin(paises)]
+    tabla = resumen_histograma(celdas, ["catalogo", "country_list"], "duracion_min")
+    return alinear(
+        tabla.drop(columns="desviacion"),
+        ["cantidad", "promedio", "mediana"],
+        _catalogos(apilado),
+    )
+
+
+@memoizar(MAX_ENTRADAS, TTL_SEGUNDOS)
+def comparar_tiempo(apilado, tipos, año_min, año_max):
+    """Años entre lanzamiento e incorporacion por catalogo y tipo."""
+    celdas = rebanar(apilado["tiempo"], tipos, año_min, año_max)
+    minimo, maximo = RANGO_DIFERENCIA
+    celdas = celdas[celdas["años_diferencia"].between(minimo, maximo)]
+    tabla = resumen_histograma(celdas, ["catalogo", "type"], "años_diferencia")
+    return alinear(
+        tabla.drop(columns="desviacion"),
+        ["cantidad", "promedio", "mediana"],
+        _catalogos(apilado),
+    )
@@ -0,0 +1,171 @@
+"""Recomendador de titulos similares por contenido.
+
+Cada titulo es un vector disperso con bloques de caracteristicas: generos,
+paises, rating, personas (director y reparto) y las palabras de la
+descripcion. Cada caracteristica pesa su idf (las comunes pesan poco), cada
+bloque se normaliza por separado (un reparto largo no tapa a los generos) y
+el vector final tiene norma 1, de modo que el producto es la similitud coseno.
+
+La matriz se guarda dos veces en formato CSR: por fila (las caracteristicas
+de cada titulo) y por caracteristica (los titulos que la tienen, como el
+indice de `busqueda`). La similitud de un titulo con todo el catalogo es el
+producto de la matriz por su vector, y solo recorre las listas de sus
+caracteristicas: los titulos sin nada en comun nunca se tocan.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.compute as pc
+from pandas.api.types import union_categoricals
+
+from busqueda import palabras
+from datos import SIN_PAIS, SIN_PERSONA, construir_puente
+from indices import posiciones
+
+# Peso relativo de cada bloque de caracteristicas
+PESOS = {"genero": 1.0, "persona": 0.8, "palabra": 0.8, "pais": 0.5, "rating": 0.3}
+
+# Las palabras presentes en mas de esta fraccion de titulos son vacias ("the",
+# "a", "his"): no distinguen titulos y sus listas son las mas largas
+MAX_FRECUENCIA_PALABRA = 0.1
+
+# Valores imputados en la limpieza, que no describen al titulo
+SIN_DATO = [SIN_PERSONA, SIN_PAIS]
+
+# limites_fila, caracteristicas, pesos_fila: caracteristicas[limites_fila[f]:
+#     limites_fila[f + 1]] son las de la fila f, con su peso
+# limites, filas, pesos: filas[limites[c]:limites[c + 1]] son las filas con
+#     la caracteristica c (ordenadas), con su peso
+IndiceSimilares = namedtuple(
+    "IndiceSimilares",
+    ["limites_fila", "caracteristicas", "pesos_fila", "limites", "filas", "pesos"],
+)
+
+
+def _bloque(filas, codigos, n_valores, n_filas, max_frecuencia=1.0):
+    """Pares (fila, caracteristica, peso) de un bloque, normalizados por fila.
+
+    `codigos` numera los valores de 0 a `n_valores` - 1 (-1 se ignora). El
+    peso es (1 + log tf) × idf. Se descartan las caracteristicas de un solo
+    titulo (no acercan a nadie) y las de mas de `max_frecuencia`.
+    """
+    validos = codigos >= 0
+    pares, tf = np.unique(
+        filas[validos].astype(np.int64) * n_valores + codigos[validos],
+        return_counts=True,
+    )
+    filas, codigos = pares // n_valores, pares % n_valores
+    frecuencia = np.bincount(codigos, minlength=n_valores)
+    utiles = (frecuencia >= 2) & (frecuencia <= max_frecuencia * n_filas)
+
+    conservar = utiles[codigos]
+    filas, codigos, tf = filas[conservar], codigos[conservar], tf[conservar]
+    pesos = (1 + np.log(tf)) * np.log(n_filas / frecuencia[codigos])
+    normas = np.sqrt(np.bincount(filas, weights=pesos**2, minlength=n_filas))
+    # Codigos compactos: solo las caracteristicas que quedaron
+    compactos = np.cumsum(utiles) - 1
+    return filas, compactos[codigos], pesos / normas[filas], utiles.sum()
+
+
+def _codigos(categorias):
+    """Codigos y cantidad de valores de un categorico, sin los imputados."""
+    categorias = pd.Categorical(categorias)
+    imputados = np.flatnonzero(categorias.categories.isin(SIN_DATO))
+    codigos = categorias.codes.astype(np.int64)
+    codigos[np.isin(codigos, imputados)] = -1
+    return codigos, len(categorias.categories)
+
+
+def construir_similares(df, puente_pais, puente_genero, textos):
+    """Indice de similitud a partir del catalogo, sus puentes y sus textos."""
+    n_filas = len(df)
+    directores = construir_puente(df["director"], "persona")
+    reparto = construir_puente(textos["cast"], "persona")
+    filas_palabra, encontradas = palabras(textos["description"])
+    encontradas = pc.dictionary_encode(encontradas)
+    fuentes = {
+        "genero": (puente_genero["fila"], _codigos(puente_genero["genre_list"])),
+        "pais": (puente_pais["fila"], _codigos(puente_pais["country_list"])),
+        "rating": (np.arange(n_filas), _codigos(df["rating"])),
+        "persona": (
+            pd.concat([directores["fila"], reparto["fila"]]),
+            _codigos(
+                union_categoricals([directores["persona"], reparto["persona"]])
+            ),
+        ),
+        "palabra": (
+            filas_palabra,
+            (
+                encontradas.indices.to_numpy().astype(np.int64),
+                len(encontradas.dictionary),
+            ),
+        ),
+    }
+
+    partes, desplazamiento = [], 0
+    for nombre, (filas, (codigos, n_valores)) in fuentes.items():
+        filas, codigos, pesos, n_utiles = _bloque(
+            np.asarray(filas),
+            codigos,
+            n_valores,
+            n_filas,
+            MAX_FRECUENCIA_PALABRA if nombre == "palabra" else 1.0,
+        )
+        partes.append((filas, codigos + desplazamiento, pesos * PESOS[nombre]))
+        desplazamiento += n_utiles
+
+    filas = np.concatenate([p[0] for p in partes])
+    caracteristicas = np.concatenate([p[1] for p in partes])
+    pesos = np.concatenate([p[2] for p in partes])
+    pesos /= np.sqrt(np.bincount(filas, weights=pesos**2, minlength=n_filas))[filas]
+    pesos = pesos.astype(np.float32)
+
+    # Cada par (fila, caracteristica) es unico: una clave entera basta para
+    # ordenar por uno u otro eje
+    por_fila = np.argsort(filas * desplazamiento + caracteristicas)
+    por_caracteristica = np.argsort(caracteristicas * n_filas + filas)
+    limites_fila = np.zeros(n_filas + 1, dtype=np.int64)
+    limites_fila[1:] = np.cumsum(np.bincount(filas, minlength=n_filas))
+    limites = np.zeros(desplazamiento + 1, dtype=np.int64)
+    limites[1:] = np.cumsum(np.bincount(caracteristicas, minlength=desplazamiento))
+    return IndiceSimilares(
+        limites_fila,
+        caracteristicas[por_fila].astype(np.int32),
+        pesos[por_fila],
+        limites,
+        filas[por_caracteristica].astype(np.int32),
+        pesos[por_caracteristica],
+    )
+
+
+# ── Consultas ─────────────────────────────────────────────────────────────────
+def similares(indice, fila, filas=None, k=10):
+    """Las `k` filas mas parecidas a `fila`: (filas, similitudes) de mayor a menor.
+
+    `filas` (ordenadas) restringe los candidatos, por ejemplo a los que
+    pasan los filtros del panel. La fila consultada nunca se devuelve.
+    """
+    tramo = slice(indice.limites_fila[fila], indice.limites_fila[fila + 1])
+    caracteristicas, pesos = indice.caracteristicas[tramo], indice.pesos_fila[tramo]
+
+    # Producto matriz × vector por las listas de cada caracteristica
+    inicios = indice.limites[caracteristicas]
+    largos = indice.limites[caracteristicas + 1] - inicios
+    tramos = posiciones(inicios, largos)
+    candidatas = indice.filas[tramos]
+    aportes = indice.pesos[tramos] * np.repeat(pesos, largos)
+    puntajes = np.bincount(
+        candidatas, weights=aportes, minlength=len(indice.limites_fila) - 1
+    )
+
+    puntajes[fila] = 0
+    if filas is None:
+        candidatas = np.flatnonzero(puntajes)
+    else:
+        candidatas = filas[puntajes[filas] > 0]
+    if len(candidatas) > k:
+        mejores = np.argpartition(-puntajes[candidatas], k)[:k]
+        candidatas = candidatas[mejores]
+    orden = np.lexsort((candidatas, -puntajes[candidatas]))
+    return candidatas[orden], puntajes[candidatas[orden]]
@@ -0,0 +1,111 @@
+"""Tendencias de incorporacion al catalogo por mes o por semana.
+
+`date_added` se convierte en un periodo (mes, o semana de lunes a domingo)
+y se cuentan los titulos agregados en cada periodo por tipo y por valor de
+una dimension (genero, pais o el total). Se guardan las sumas acumuladas:
+los titulos agregados entre dos fechas cualesquiera son la resta de dos
+columnas, ubicadas con busqueda binaria sobre las fechas de los periodos,
+sin volver a filtrar filas. Las ventanas moviles son la misma resta con un
+desplazamiento de `ventana` periodos.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from datos import SIN_PAIS, parsear_fechas, por_valor
+
+GRANULARIDADES = ("mes", "semana")
+
+# fechas:    inicio de cada periodo (datetime64[D]), consecutivos y ordenados
+# tipos:     valores de `type`
+# valores:   valores de la dimension
+# acumulado: acumulado[t, v, p] son los titulos del tipo t y valor v
+#            agregados antes del periodo p (p = 0..len(fechas))
+Tendencia = namedtuple("Tendencia", ["fechas", "tipos", "valores", "acumulado"])
+
+
+def _periodos(fechas, granularidad):
+    """Periodo de cada fecha (un entero) y fecha de inicio de cada periodo."""
+    if granularidad == "mes":
+        periodo = fechas.astype("datetime64[M]").astype(np.int64)
+        todos = np.arange(periodo.min(), periodo.max() + 1)
+        return periodo, todos.astype("datetime64[M]").astype("datetime64[D]")
+    # Semanas de lunes a domingo: el 1970-01-01 fue jueves
+    periodo = (fechas.astype("datetime64[D]").astype(np.int64) + 3) // 7
+    todos = np.arange(periodo.min(), periodo.max() + 1)
+    return periodo, (todos * 7 - 3).astype("datetime64[D]")
+
+
+def _tendencia(filas, valores, tipo, periodo, inicios):
+    """Acumulado por tipo, valor y periodo de los pares (fila, valor)."""
+    valores = pd.Categorical(valores)
+    codigos = valores.codes.astype(np.int64)
+    validas = (codigos >= 0) & (periodo[filas] >= 0)
+    filas, codigos = filas[validas], codigos[validas]
+
+    n_tipos, n_valores = len(tipo.categories), len(valores.categories)
+    n_periodos = len(inicios)
+    plano = (tipo.codes[filas].astype(np.int64) * n_valores + codigos) * n_periodos
+    conteo = np.bincount(
+        plano + periodo[filas], minlength=n_tipos * n_valores * n_periodos
+    ).reshape(n_tipos, n_valores, n_periodos)
+    acumulado = np.zeros((n_tipos, n_valores, n_periodos + 1), dtype=np.int32)
+    np.cumsum(conteo, axis=-1, out=acumulado[..., 1:])
+    return Tendencia(
+        inicios,
+        tipo.categories.to_numpy(dtype=object),
+        valores.categories.to_numpy(dtype=object),
+        acumulado,
+    )
+
+
+def construir_tendencias(df, puente_pais, puente_genero):
+    """Tendencias por granularidad y dimension: {granularidad: {dimension: ...}}."""
+    fechas = por_valor(df["date_added"], parsear_fechas).to_numpy("datetime64[D]")
+    validas = ~np.isnat(fechas)
+    tipo = pd.Categorical(df["type"])
+    pais = puente_pais[puente_pais["country_list"] != SIN_PAIS]
+    dimensiones = {
+        "total": (np.arange(len(df)), np.full(len(df), "Total", dtype=object)),
+        "genero": (puente_genero["fila"].to_numpy(), puente_genero["genre_list"]),
+        "pais": (pais["fila"].to_numpy(), pais["country_list"]),
+    }
+
+    resultado = {}
+    for granularidad in GRANULARIDADES:
+        periodo = np.full(len(df), -1, dtype=np.int64)
+        crudo, inicios = _periodos(fechas[validas], granularidad)
+        periodo[validas] = crudo - crudo.min()
+        resultado[granularidad] = {
+            nombre: _tendencia(filas, valores, tipo, periodo, inicios)
+            for nombre, (filas, valores) in dimensiones.items()
+        }
+    return resultado
+
+
+# ── Consultas ─────────────────────────────────────────────────────────────────
+def tramo(tendencia, desde, hasta):
+    """Periodos [i, j) que tocan las fechas [desde, hasta], por busqueda binaria."""
+    desde, hasta = np.datetime64(desde, "D"), np.datetime64(hasta, "D")
+    i = max(np.searchsorted(tendencia.fechas, desde, side="right") - 1, 0)
+    j = np.searchsorted(tendencia.fechas, hasta, side="right")
+    return i, max(i, j)
+
+
+def acumulado(tendencia, tipos):
+    """Acumulado valor × periodo sumando los `tipos` elegidos."""
+    elegidos = np.isin(tendencia.tipos, list(tipos))
+    return tendencia.acumulado[elegidos].sum(axis=0)
+
+
+def agregados(acumulados, i, j):
+    """Titulos agregados en los periodos [i, j) por valor: una resta."""
+    return acumulados[:, j] - acumulados[:, i]
+
+
+def ventana_movil(acumulados, ventana):
+    """Titulos agregados en los `ventana` periodos que terminan en cada periodo."""
+    n_periodos = acumulados.shape[1] - 1
+    previos = np.maximum(np.arange(1, n_periodos + 1) - ventana, 0)
+    return acumulados[:, 1:] - acumulados[:, previos]
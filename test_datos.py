@@ -0,0 +1,77 @@
+"""Pruebas de la carga incremental: debe dar lo mismo que una carga completa."""
+import pandas as pd
+import pytest
+
+import datos
+
+FILAS_INICIALES = 500
+
+
+@pytest.fixture
+def crudo():
+    return pd.read_csv(datos.RUTA_CATALOGO, dtype=str, nrows=2 * FILAS_INICIALES)
+
+
+def _cargar_y_agregar(ruta, cache, iniciales, agregadas):
+    """Carga `iniciales` con cache (catalogo y cubo) y agrega filas al CSV."""
+    iniciales.to_csv(ruta, index=False)
+    datos.cargar_cubo(str(ruta), cache)
+    with open(ruta, "a") as f:
+        agregadas.to_csv(f, index=False, header=False)
+    return datos.cargar_catalogo(str(ruta), directorio_cache=cache)
+
+
+def _comparar(ruta, cache, incremental):
+    completo = datos.cargar_catalogo(str(ruta), directorio_cache=None)
+    for parte, esperada in zip(incremental, completo):
+        pd.testing.assert_frame_equal(
+            parte.astype(str).reset_index(drop=True),
+            esperada.astype(str).reset_index(drop=True),
+        )
+    pd.testing.assert_frame_equal(
+        datos.cargar_cuarentena(str(ruta), cache).astype(str),
+        datos.cargar_cuarentena(str(ruta), None).astype(str),
+    )
+
+
+def test_agregado_sin_reemplazos(tmp_path, crudo):
+    iniciales = crudo.iloc[:FILAS_INICIALES].copy()
+    iniciales.loc[3, "rating"] = "XX"
+    agregadas = crudo.iloc[FILAS_INICIALES:].copy()
+    agregadas.iloc[0, agregadas.columns.get_loc("duration")] = None
+    ruta, cache = tmp_path / "catalogo.csv", tmp_path / "cache"
+    incremental = _cargar_y_agregar(ruta, cache, iniciales, agregadas)
+    _comparar(ruta, cache, incremental)
+
+
+def test_agregado_con_reemplazos(tmp_path, crudo):
+    # Reemplaza un titulo valido y uno en cuarentena; la version anterior de
+    # ambos pasa a la cuarentena como `show_id_duplicado`
+    iniciales = crudo.iloc[:FILAS_INICIALES].copy()
+    iniciales.loc[3, "rating"] = "XX"
+    agregadas = pd.concat(
+        [
+            crudo.iloc[FILAS_INICIALES:],
+            iniciales.iloc[[10]].assign(title="Nueva version"),
+            iniciales.iloc[[3]].assign(rating="PG"),
+        ]
+    )
+    ruta, cache = tmp_path / "catalogo.csv", tmp_path / "cache"
+    incremental = _cargar_y_agregar(ruta, cache, iniciales, agregadas)
+    _comparar(ruta, cache, incremental)
+    motivos = datos.cargar_cuarentena(str(ruta), cache)["motivos"].astype(str)
+    assert motivos.str.contains("show_id_duplicado").sum() == 2
+
+
+def test_reconstruccion_borra_la_generacion_anterior(tmp_path, crudo):
+    ruta, cache = tmp_path / "catalogo.csv", tmp_path / "cache"
+    _cargar_y_agregar(ruta, cache, crudo.iloc[:FILAS_INICIALES], crudo.iloc[:0])
+    antes = {p.name for p in cache.iterdir()}
+    # Un cambio dentro de lo ya leido obliga a recargar todo
+    ruta.write_text(ruta.read_text().replace(crudo.loc[0, "title"], "Editado", 1))
+    datos.cargar_catalogo(str(ruta), directorio_cache=cache)
+    huella = datos.hash_archivo(str(ruta))
+    assert not antes & {p.name for p in cache.iterdir() if p.suffix == ".feather"}
+    assert all(
+        p.name.startswith(huella) for p in cache.iterdir() if p.suffix == ".feather"
+    )